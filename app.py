@@ -4,9 +4,15 @@ Streamlit web application for SensorTower app data scraping and management.
 
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import contextlib
+import io
 import json
+import math
+import os
+import queue
 import time
-import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import database
 import scraper
@@ -20,92 +26,501 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+@st.cache_resource(show_spinner=False)
+def _ensure_db():
+    """Initialize the database once per server process instead of on every rerun or session."""
+    database.init_db()
+    return True
+
+
 # Initialize database
-database.init_db()
+_ensure_db()
+
+# Show full tracebacks in the UI only when APP_DEBUG is set
+DEBUG = bool(os.environ.get("APP_DEBUG"))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_history() -> pd.DataFrame:
+    """Cached wrapper around database.get_history() shared across reruns."""
+    return database.get_history()
 
 
-def format_iap_display(iap_json: str) -> str:
-    """Format in-app purchases JSON for display."""
-    if not iap_json:
-        return "None"
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_app_id(search_term: str, _headless: bool, _browser=None) -> str:
+    """Cached Apple Store name -> App ID lookup (only the search term is part of the key)."""
+    app_id = scraper.get_app_id_from_apple(search_term, headless=_headless, browser=_browser)
+    if not app_id:
+        # Raise so that failed lookups are not cached
+        raise LookupError(search_term)
+    return app_id
+
+
+def resolve_app_id(search_term: str, headless: bool = True, browser=None):
+    """Return the App ID for an app name, reusing previous lookups when possible."""
     try:
-        iap_list = json.loads(iap_json) if isinstance(iap_json, str) else iap_json
-        if isinstance(iap_list, list) and len(iap_list) > 0:
-            formatted = []
-            for item in iap_list:
-                title = item.get('title', 'N/A')
-                duration = item.get('duration', 'N/A')
-                price = item.get('price', 'N/A')
-                formatted.append(f"{title} ({duration}): {price}")
-            return "\n".join(formatted)
-        return "None"
-    except:
-        return str(iap_json) if iap_json else "None"
-
-
-def convert_text_to_number(text_value):
+        return _cached_app_id(search_term, headless, browser)
+    except LookupError:
+        return None
+
+
+# Each filter combination (every typed name prefix included) is its own
+# cache entry, so bound how many are kept
+FILTER_CACHE_ENTRIES = 32
+
+
+@st.cache_data(ttl=30, max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def _cached_filtered_history(category, price, name_substr) -> pd.DataFrame:
     """
-    Convert text values like '8.2K', '134K', '13M', '200k', '< $5k' to plain numbers.
-    
-    Examples:
-    - '8.2K' -> 8200
-    - '134K' -> 134000
-    - '13M' -> 13000000
-    - '200k' -> 200000
-    - '< $5k' -> 0 (less than 5000, so treat as 0)
-    - '< 5k' -> 0 (less than 5000, so treat as 0)
-    - '40K' -> 40000
+    Cached list of the apps matching the filter values (newest first).
+    
+    Only the columns the selectors need are loaded; the table page and the
+    Detailed View fetch their own rows.
     """
-    if pd.isna(text_value) or text_value == '' or text_value is None:
-        return None
+    df = database.query_history(category=category, price=price, name_substr=name_substr,
+                                columns=SELECTOR_COLUMNS)
+    if 'app_name' in df.columns:
+        # Normalized once here so reruns reuse ready-made selector labels
+        df['app_name'] = df['app_name'].fillna('Unknown').astype(str)
+        df['delete_label'] = df['app_name'] + ' (ID: ' + df['app_id'].fillna('N/A').astype(str) + ')'
+    return df
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_app_record(record_id: int):
+    """Cached full row for the Detailed View, with its in-app purchase JSON parsed once."""
+    record = database.get_app_by_record_id(record_id)
+    if record:
+        record['_iap_parsed'] = _parse_iap(record.get('in_app_purchases'))
+    return record
+
+
+# Columns loaded for the Quick Delete and Detailed View selectors
+SELECTOR_COLUMNS = ['id', 'app_id', 'app_name']
+
+# Columns shown in the Database tab (numeric columns instead of text columns)
+DISPLAY_COLUMNS = ('app_name', 'app_id', 'categories', 'category_ranking', 'price', 'developer_name', 
+                   'content_rating', 
+                   # Use numeric columns instead of text columns
+                   'average_rating_numeric',  # Instead of 'average_rating'
+                   'rating_count_numeric',     # Instead of 'rating_count'
+                   'downloads_numeric',        # Instead of 'downloads_worldwide'
+                   'revenue_numeric',          # Instead of 'revenue_worldwide'
+                   'release_date', 'publisher_country', 'last_updated', 'scraped_at')
+
+# Rows per page in the Database tab table
+HISTORY_PAGE_SIZE = 100
+
+# Table columns with few distinct values
+CATEGORICAL_COLUMNS = ('categories', 'price', 'content_rating', 'publisher_country')
+
+# Number formatting for the numeric table columns, built once
+TABLE_COLUMN_CONFIG = {
+    # Rating: show 1 decimal place
+    'Rating': st.column_config.NumberColumn('Rating', format="%.1f"),
+    # Large numbers: format with commas
+    'Rating Count': st.column_config.NumberColumn('Rating Count', format="%d"),
+    'Downloads': st.column_config.NumberColumn('Downloads', format="%d"),
+    'Revenue': st.column_config.NumberColumn('Revenue', format="%d"),
+    # Revenue per download: show 2 decimal places (currency-like)
+    'Revenue / Download': st.column_config.NumberColumn('Revenue / Download', format="%.2f"),
+    # Scrape time: stored as epoch milliseconds, read back as local datetimes
+    'scraped_at': st.column_config.DatetimeColumn('scraped_at', format="YYYY-MM-DD HH:mm:ss"),
+}
+
+# In-app purchase lists up to this size are rendered as a static table
+IAP_STATIC_TABLE_MAX_ROWS = 50
+
+# Minimum seconds between batch progress updates (about 10 per second)
+PROGRESS_UPDATE_INTERVAL = 0.1
+
+# Columns read from SQLite for the table (display columns plus IAP sources)
+TABLE_QUERY_COLUMNS = DISPLAY_COLUMNS + ('in_app_purchases', 'in_app_purchases_text')
+
+# Display names for the numeric columns (remove "_numeric" suffix)
+NUMERIC_COLUMN_RENAMES = {
+    'average_rating_numeric': 'Rating',
+    'rating_count_numeric': 'Rating Count',
+    'downloads_numeric': 'Downloads',
+    'revenue_numeric': 'Revenue',
+}
+
+
+# Fields shown in the Detailed View, with their labels precomputed once
+DETAIL_BASIC_COLUMNS = ('app_name', 'app_id', 'categories', 'category_ranking', 'price', 'content_rating',
+                        'average_rating', 'rating_count', 'release_date', 'publisher_country', 'last_updated')
+DETAIL_METRIC_COLUMNS = ('developer_name', 'developer_website', 'support_url',
+                         'downloads_worldwide', 'revenue_worldwide', 'top_countries')
+DETAIL_LABELS = {col: col.replace('_', ' ').title() for col in DETAIL_BASIC_COLUMNS + DETAIL_METRIC_COLUMNS}
+
+
+@st.cache_data(show_spinner=False)
+def _project_columns(columns: tuple) -> tuple:
+    """DISPLAY_COLUMNS that exist in a frame with the given columns (the schema rarely changes)."""
+    return tuple(col for col in DISPLAY_COLUMNS if col in columns)
+
+
+def revenue_per_download(revenue: pd.Series, downloads: pd.Series) -> pd.Series:
+    """Revenue / Download (ARPU), NaN where either value is missing or there are no downloads."""
+    revenue = pd.to_numeric(revenue, errors='coerce')
+    downloads = pd.to_numeric(downloads, errors='coerce')
+    return revenue / downloads.where(downloads > 0)
+
+
+def build_display_df(filtered_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the Database tab table from a history DataFrame.
     
-    # Convert to string and strip whitespace
-    text = str(text_value).strip()
+    Selects the display columns, renames the numeric columns, formats the
+    in-app purchases and adds the Revenue / Download column.
+    """
+    # Only show columns that exist in the DataFrame
+    available_columns = list(_project_columns(tuple(filtered_df.columns)))
     
-    # Handle empty strings
-    if not text or text.lower() in ['n/a', 'none', '']:
-        return None
+    # Select only the columns that exist; this already builds a new
+    # frame, so no up-front filtered_df.copy() is needed
+    display_df = filtered_df[available_columns]
     
-    # Check for "< 5k" or "< $5k" patterns - these mean less than 5000, so return 0
-    if re.match(r'^[<]\s*\$?\s*5\s*[kK]', text, re.IGNORECASE):
-        return 0
+    # Rename numeric columns for cleaner display; relabel the new frame in
+    # place rather than copying it again through .rename()
+    display_df.columns = [NUMERIC_COLUMN_RENAMES.get(col, col) for col in available_columns]
     
-    # Check for "< 5k" in downloads/revenue context
-    if re.match(r'^[<]\s*\$?\s*5', text, re.IGNORECASE):
-        return 0
+    # Format IAP column if exists (prefer the text stored at save time)
+    if 'in_app_purchases_text' in filtered_df.columns:
+        iap_text = filtered_df['in_app_purchases_text']
+        missing = iap_text.isna()
+        if missing.any() and 'in_app_purchases' in filtered_df.columns:
+            iap_text = iap_text.where(~missing, format_iap_column(filtered_df['in_app_purchases']))
+        display_df['in_app_purchases'] = iap_text.fillna("None")
+    elif 'in_app_purchases' in filtered_df.columns:
+        display_df['in_app_purchases'] = format_iap_column(filtered_df['in_app_purchases'])
     
-    # Remove common prefixes like '< $', '$', etc. (but we already handled < 5k above)
-    text = re.sub(r'^[<>=]?\s*\$?\s*', '', text, flags=re.IGNORECASE)
+    # Ensure numeric columns maintain their numeric type for proper sorting
+    # Low-cardinality text columns are stored as categoricals, which the
+    # Arrow table keeps dictionary-encoded (one copy of each distinct value)
+    for col in CATEGORICAL_COLUMNS:
+        if col in display_df.columns:
+            display_df[col] = display_df[col].astype('category')
     
-    # Extract number and unit
-    # Match patterns like: "8.2K", "134K", "13M", "200k", "5k", etc.
-    match = re.match(r'([\d.]+)\s*([KMBkmb]?)', text, re.IGNORECASE)
+    numeric_cols = [col for col in NUMERIC_COLUMN_RENAMES.values() if col in display_df.columns]
+    if numeric_cols:
+        display_df[numeric_cols] = display_df[numeric_cols].apply(pd.to_numeric, errors='coerce')
     
-    if not match:
-        # Try to extract just a number if no unit
-        try:
-            return float(text.replace(',', ''))
-        except:
-            return None
+    # Calculate Revenue / Download (ARPU - Average Revenue Per User)
+    # Handle division by zero and missing values
+    if 'Revenue' in display_df.columns and 'Downloads' in display_df.columns:
+        display_df['Revenue / Download'] = revenue_per_download(display_df['Revenue'], display_df['Downloads'])
+    
+    return display_df
+
+
+@st.cache_data(ttl=30, max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def _cached_display_history(category, price, name_substr, page: int = 1) -> pa.Table:
+    """
+    Cached display table for one page of a filter combination.
     
-    number_str = match.group(1)
-    unit = match.group(2).upper() if match.group(2) else ''
+    Only that page's rows and the displayed columns are read from SQLite.
+    Returned as an Arrow table, which st.dataframe renders without its own
+    pandas -> Arrow conversion on every rerun.
+    """
+    page_df = database.query_history(category=category, price=price, name_substr=name_substr,
+                                     limit=HISTORY_PAGE_SIZE, offset=(page - 1) * HISTORY_PAGE_SIZE,
+                                     columns=TABLE_QUERY_COLUMNS)
+    return pa.Table.from_pandas(build_display_df(page_df), preserve_index=False)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_summary_stats() -> dict:
+    """Cached wrapper around database.get_summary_stats()."""
+    return database.get_summary_stats()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_categories() -> list:
+    """Cached list of distinct categories for the filter dropdown."""
+    return database.get_categories()
+
+
+def _invalidate_caches():
+    """Drop cached database reads after a write so the next rerun sees fresh data."""
+    _cached_history.clear()
+    _cached_filtered_history.clear()
+    _cached_display_history.clear()
+    _cached_app_record.clear()
+    _cached_summary_stats.clear()
+    _cached_categories.clear()
+
+
+def _record_save(count: int = 1):
+    """Invalidate cached reads and bump the per-session saved counter."""
+    _invalidate_caches()
+    st.session_state['saved_count'] = st.session_state.get('saved_count', 0) + count
+    return st.session_state['saved_count']
+
+
+def format_iap_column(iap_series: pd.Series) -> pd.Series:
+    """
+    Format a whole column of in-app purchase JSON for display.
     
+    Each distinct payload is parsed once and mapped back onto the column,
+    instead of running database.format_iap_display() per row through .apply().
+    """
+    formatted = {value: database.format_iap_display(value) for value in iap_series.dropna().unique()}
+    return iap_series.map(formatted).fillna("None")
+
+
+def _parse_iap(iap_json):
+    """Parse a stored in-app purchase payload, returning the raw value if it is not valid JSON."""
+    if not isinstance(iap_json, str) or not iap_json:
+        return iap_json
     try:
-        number = float(number_str)
+        return json.loads(iap_json)
+    except json.JSONDecodeError:
+        return iap_json
+
+
+def render_iap_table(iap_list: list):
+    """
+    Show a list of in-app purchases as a table.
+    
+    Typical lists are a handful of rows, so they are rendered as a static
+    st.table; only long lists get the interactive st.dataframe grid. The
+    frame is built directly: for lists this small, st.cache_data's hashing
+    and copy cost more than pd.DataFrame() itself.
+    """
+    iap_df = pd.DataFrame(iap_list)
+    if len(iap_df) <= IAP_STATIC_TABLE_MAX_ROWS:
+        st.table(iap_df)
+    else:
+        st.dataframe(iap_df, width='stretch')
+
+
+def render_batch_summary(summary: dict):
+    """Show the outcome of the last batch scrape (kept in session state across reruns)."""
+    results = summary['results']
+    st.success(f"✅ Batch processing complete! Processed {summary['processed']} items")
+    if summary.get('duplicates'):
+        st.caption(f"Removed {summary['duplicates']} duplicate entries")
+    if summary.get('already_saved'):
+        st.caption(f"Skipped {summary['already_saved']} App IDs already in the database")
+    
+    # Display results summary; success + skipped + failed adds up to the processed items
+    success_count = sum(1 for r in results if r['status'] == 'success')
+    skipped_count = sum(1 for r in results if r['status'] == 'skipped')
+    failed_count = len(results) - success_count - skipped_count
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("✅ Successfully Saved", success_count)
+    with col2:
+        st.metric("⚠️ Skipped", skipped_count)
+    with col3:
+        st.metric("❌ Failed", failed_count)
+    
+    # Show detailed results
+    with st.expander("📊 Batch Results Details", expanded=True):
+        for result in results:
+            if result['status'] == 'success':
+                st.success(f"✅ {result['item']} → {result['app_name']} (ID: {result['app_id']})")
+            elif result['status'] == 'skipped':
+                st.warning(f"⚠️ {result['item']} → {result.get('error', 'Skipped')}")
+            else:
+                st.error(f"❌ {result['item']} → {result.get('error', 'Failed')}")
+
+
+def scrape_batch_item(item: str, search_mode: str, headless: bool, browser=None) -> dict:
+    """
+    Resolve and scrape a single batch item.
+    
+    Runs on a worker thread, so it must not call any Streamlit APIs; the
+    caller renders the outcome and saves the data on the main thread.
+    `browser` is an optional already-launched browser owned by that thread.
+    
+    Returns:
+        Dictionary with 'item', 'status' ('scraped' or 'skipped') and either
+        'app_data' or 'error'
+    """
+    if search_mode == "App ID":
+        if not item.isdigit():
+            return {'item': item, 'status': 'skipped', 'error': "Not a valid App ID"}
+        current_app_id = item
+        current_search_term = f"App ID: {item}"
+    else:
+        # Search Apple Store for App ID
+        current_search_term = item
+        current_app_id = resolve_app_id(item, headless=headless, browser=browser)
+        if not current_app_id:
+            return {'item': item, 'status': 'skipped', 'error': "Could not find App ID on Apple Store"}
+    
+    app_data = scraper.scrape_app_data(
+        current_search_term,
+        headless=headless,
+        app_id=current_app_id,
+        browser=browser
+    )
+    return {'item': item, 'status': 'scraped', 'app_data': app_data}
+
+
+def run_batch_worker(work_queue: queue.Queue, result_queue: queue.Queue, search_mode: str, headless: bool):
+    """
+    Batch worker: take items from work_queue until it is empty and put each
+    scrape outcome on result_queue.
+    
+    The worker keeps one browser open for all of its items. Playwright objects
+    are tied to the thread that created them, so each worker owns its session.
+    """
+    with contextlib.ExitStack() as stack:
+        try:
+            browser = stack.enter_context(scraper.BrowserSession(headless=headless)).browser
+        except Exception as e:
+            print(f"Could not start shared browser, launching one per item: {e}")
+            browser = None
+        
+        while True:
+            try:
+                item = work_queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                outcome = scrape_batch_item(item, search_mode, headless, browser=browser)
+            except Exception as e:
+                outcome = {'item': item, 'status': 'error', 'error': str(e)}
+            result_queue.put(outcome)
+
+
+@st.fragment
+def _quick_delete_section(filtered_df: pd.DataFrame, app_names: pd.Series):
+    """
+    Quick Delete selector and button.
+    
+    Runs as a fragment so changing the selection only reruns this section;
+    a successful delete still reruns the whole app to refresh the table.
+    """
+    st.divider()
+    st.subheader("🗑️ Quick Delete")
+    st.caption("Select an app to delete quickly")
+    
+    # Create a selectbox for quick delete (labels come with the cached list,
+    # with a label -> (app_id, app_name) map for O(1) selection)
+    delete_options = filtered_df['delete_label'].tolist()
+    delete_lookup = dict(zip(delete_options, zip(filtered_df['app_id'].fillna('').tolist(),
+                                                 app_names.tolist())))
+    selected_delete = st.selectbox(
+        "Select app to delete",
+        options=delete_options,
+        key="quick_delete_select"
+    )
+    
+    if selected_delete:
+        # Look up app_id from selection
+        delete_app_id, delete_app_name = delete_lookup[selected_delete]
         
-        # Multiply based on unit
-        if unit == 'K':
-            return int(number * 1000)
-        elif unit == 'M':
-            return int(number * 1000000)
-        elif unit == 'B':
-            return int(number * 1000000000)
+        delete_btn_col1, delete_btn_col2 = st.columns([3, 1])
+        with delete_btn_col2:
+            if st.button("🗑️ Delete Selected", type="secondary", width='stretch', 
+                       key=f"quick_delete_{delete_app_id}"):
+                if delete_app_id:
+                    success = database.delete_app(delete_app_id)
+                    if success:
+                        _invalidate_caches()
+                        st.toast(f"Deleted '{delete_app_name}'", icon="✅")
+                        st.rerun()
+                    else:
+                        st.error("❌ Failed to delete app. It may have already been deleted.")
+                else:
+                    st.error("❌ Cannot delete: No App ID found.")
+
+
+@st.fragment
+def _detail_section(filtered_df: pd.DataFrame, app_names: pd.Series):
+    """
+    Detailed View for one selected app, with its delete confirmation.
+    
+    Runs as a fragment so picking another app only reruns this section.
+    """
+    # Plain list of labels so format_func is a list lookup, not an .iloc per option
+    detail_names = app_names.tolist()
+    selected_index = st.selectbox(
+        "Select an app to view details",
+        options=range(len(detail_names)),
+        format_func=detail_names.__getitem__
+    )
+    
+    # Plain dict, so the lookups below are dict gets rather than Series indexing
+    selected_app = filtered_df.iloc[selected_index].to_dict()
+    
+    # Delete button at the top
+    delete_col1, delete_col2 = st.columns([3, 1])
+    with delete_col2:
+        app_id_to_delete = selected_app.get('app_id', '')
+        app_name_to_delete = selected_app.get('app_name', 'Unknown')
+        delete_key = f"delete_{app_id_to_delete}_{selected_index}"
+        
+        if st.button("🗑️ Delete", type="secondary", width='stretch', key=delete_key):
+            # Confirmation dialog
+            st.warning(f"⚠️ Are you sure you want to delete '{app_name_to_delete}'?")
+            confirm_col1, confirm_col2 = st.columns(2)
+            with confirm_col1:
+                if st.button("✅ Yes, Delete", key=f"confirm_delete_{delete_key}"):
+                    if app_id_to_delete:
+                        success = database.delete_app(app_id_to_delete)
+                        if success:
+                            _invalidate_caches()
+                            st.toast(f"Deleted '{app_name_to_delete}'", icon="✅")
+                            st.rerun()
+                        else:
+                            st.error("❌ Failed to delete app. Check console for errors.")
+                    else:
+                        st.error("❌ Cannot delete: No App ID found.")
+            with confirm_col2:
+                if st.button("❌ Cancel", key=f"cancel_delete_{delete_key}"):
+                    st.rerun(scope="fragment")
+    
+    detail_col1, detail_col2 = st.columns(2)
+    
+    # Full row fetched on demand; the selector list only carries IDs and names
+    detail_row = _cached_app_record(int(selected_app['id'])) or {}
+    
+    with detail_col1:
+        st.write("**Basic Information**")
+        lines = []
+        for col in DETAIL_BASIC_COLUMNS:
+            display_value = detail_row.get(col)
+            if not display_value or col == 'rating_count':
+                # Skip rating_count as it's shown with average_rating
+                continue
+            # Format category ranking with # prefix if it's a number
+            if col == 'category_ranking' and not str(display_value).startswith('#'):
+                display_value = f"#{display_value}"
+            # Format rating display
+            elif col == 'average_rating':
+                rating_count_val = detail_row.get('rating_count', '')
+                if rating_count_val:
+                    display_value = f"{display_value} ⭐ ({rating_count_val} ratings)"
+                else:
+                    display_value = f"{display_value} ⭐"
+            lines.append(f"- **{DETAIL_LABELS[col]}:** {display_value}")
+        st.markdown("\n".join(lines))
+    
+    with detail_col2:
+        st.write("**Developer & Metrics**")
+        st.markdown("\n".join(
+            f"- **{DETAIL_LABELS[col]}:** {detail_row[col]}"
+            for col in DETAIL_METRIC_COLUMNS if col in detail_row
+        ))
+    
+    # In-App Purchases
+    if detail_row.get('in_app_purchases'):
+        st.write("**In-App Purchases:**")
+        # Parsed once when the row was loaded
+        iap_data = detail_row.get('_iap_parsed')
+        if isinstance(iap_data, list) and len(iap_data) > 0:
+            render_iap_table(iap_data)
+        elif isinstance(iap_data, str):
+            st.write(iap_data)
         else:
-            # No unit, return as-is
-            return int(number) if number.is_integer() else number
-    except:
-        return None
+            st.write("None")
 
 
 def main():
@@ -116,13 +531,10 @@ def main():
     with st.sidebar:
         st.header("⚙️ Settings")
         
-        # Database status - refresh on every render
+        # Database status (cached aggregate, no full table read)
         try:
-            # Ensure database is initialized
-            database.init_db()
-            history_df = database.get_history()
+            record_count = _cached_summary_stats()['total_apps']
             db_status = "✅ Connected"
-            record_count = len(history_df)
         except Exception as e:
             db_status = f"❌ Error: {str(e)}"
             record_count = 0
@@ -132,7 +544,8 @@ def main():
         st.metric("Total Records", record_count)
         
         # Refresh button to manually update record count
-        if st.button("🔄 Refresh Database Status", use_container_width=True):
+        if st.button("🔄 Refresh Database Status", width='stretch'):
+            _invalidate_caches()
             st.rerun()
         
         st.divider()
@@ -141,39 +554,29 @@ def main():
         headless_mode = st.checkbox("Headless Browser Mode", value=True, 
                                     help="Run browser in background (recommended)")
         
+        # App name -> App ID lookups are cached for an hour
+        if st.button("🧹 Clear Name → ID Cache", width='stretch'):
+            _cached_app_id.clear()
+            st.toast("Cleared cached App ID lookups")
+        
         st.divider()
         
         # Export functionality
         st.subheader("📥 Export Data")
-        if st.button("Export to Excel", use_container_width=True):
+        if st.button("Export to Excel", width='stretch'):
             try:
-                history_df = database.get_history()
-                if len(history_df) > 0:
-                    # Prepare DataFrame for export
-                    export_df = history_df.copy()
-                    
-                    # Format IAP column for better readability
-                    if 'in_app_purchases' in export_df.columns:
-                        export_df['in_app_purchases'] = export_df['in_app_purchases'].apply(format_iap_display)
-                    
-                    # Ensure numeric columns exist (they should already be in the database)
-                    # But convert them if they don't exist for some reason
-                    if 'rating_count_numeric' not in export_df.columns and 'rating_count' in export_df.columns:
-                        export_df['rating_count_numeric'] = export_df['rating_count'].apply(convert_text_to_number)
+                # st.cache_data hands back a fresh frame, so it can be modified in place
+                export_df = _cached_history()
+                if len(export_df) > 0:
                     
-                    if 'downloads_numeric' not in export_df.columns and 'downloads_worldwide' in export_df.columns:
-                        export_df['downloads_numeric'] = export_df['downloads_worldwide'].apply(convert_text_to_number)
-                        # Apply special handling for "5k" downloads
-                        downloads_mask = export_df['downloads_worldwide'].str.strip().str.lower() == '5k'
-                        export_df.loc[downloads_mask, 'downloads_numeric'] = 0
+                    # Use the IAP text pre-rendered at save time for better readability
+                    if 'in_app_purchases_text' in export_df.columns:
+                        export_df['in_app_purchases'] = export_df.pop('in_app_purchases_text').fillna("None")
+                    elif 'in_app_purchases' in export_df.columns:
+                        export_df['in_app_purchases'] = format_iap_column(export_df['in_app_purchases'])
                     
-                    if 'revenue_numeric' not in export_df.columns and 'revenue_worldwide' in export_df.columns:
-                        export_df['revenue_numeric'] = export_df['revenue_worldwide'].apply(convert_text_to_number)
-                    
-                    if 'average_rating_numeric' not in export_df.columns and 'average_rating' in export_df.columns:
-                        export_df['average_rating_numeric'] = export_df['average_rating'].apply(
-                            lambda x: float(re.sub(r'[^\d.]', '', str(x))) if pd.notna(x) and str(x).strip() else None
-                        )
+                    # The numeric columns are created and filled by database.init_db(),
+                    # so the export only needs to select and rename them
                     
                     # Exclude text-based columns, keep only numeric versions
                     columns_to_exclude = [
@@ -183,9 +586,9 @@ def main():
                         'revenue_worldwide'       # Exclude text version
                     ]
                     
-                    # Select columns to keep (all columns except the text-based ones)
-                    columns_to_keep = [col for col in export_df.columns if col not in columns_to_exclude]
-                    export_df = export_df[columns_to_keep]
+                    # Drop the text-based columns from the frame we already own
+                    # (instead of copying every other column into a new one)
+                    export_df.drop(columns=columns_to_exclude, errors='ignore', inplace=True)
                     
                     # Rename numeric columns to cleaner names for Excel
                     column_renames = {
@@ -194,37 +597,31 @@ def main():
                         'downloads_numeric': 'Downloads',
                         'revenue_numeric': 'Revenue'
                     }
-                    export_df = export_df.rename(columns=column_renames)
+                    export_df.rename(columns=column_renames, inplace=True)
                     
                     # Calculate Revenue / Download (ARPU - Average Revenue Per User)
                     # Handle division by zero and missing values
                     if 'Revenue' in export_df.columns and 'Downloads' in export_df.columns:
-                        export_df['Revenue / Download'] = export_df.apply(
-                            lambda row: (
-                                row['Revenue'] / row['Downloads'] 
-                                if pd.notna(row['Revenue']) and pd.notna(row['Downloads']) and row['Downloads'] > 0
-                                else None
-                            ),
-                            axis=1
-                        )
+                        export_df['Revenue / Download'] = revenue_per_download(export_df['Revenue'], export_df['Downloads'])
                     
                     # Generate filename with timestamp
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                     filename = f"sensortower_data_{timestamp}.xlsx"
                     
-                    # Export to Excel
-                    export_df.to_excel(filename, index=False, engine='openpyxl')
-                    st.success(f"✅ Exported {len(export_df)} records to {filename}")
+                    # Export to Excel in memory (no temporary file on disk)
+                    excel_buffer = io.BytesIO()
+                    with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
+                        export_df.to_excel(writer, index=False, freeze_panes=(1, 0))
+                    st.success(f"✅ Exported {len(export_df)} records")
                     st.info("💡 **Tip:** Only numeric columns are included for better Excel calculations and sorting!")
                     
                     # Provide download button
-                    with open(filename, 'rb') as f:
-                        st.download_button(
-                            label="📥 Download Excel File",
-                            data=f.read(),
-                            file_name=filename,
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
+                    st.download_button(
+                        label="📥 Download Excel File",
+                        data=excel_buffer.getvalue(),
+                        file_name=filename,
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
                 else:
                     st.warning("No data to export. Please scrape some apps first.")
             except Exception as e:
@@ -236,27 +633,23 @@ def main():
     with tab1:
         st.header("📊 Database")
         
-        # Get history
+        # Get summary statistics (single aggregate query)
         try:
-            history_df = database.get_history()
+            stats = _cached_summary_stats()
             
-            if len(history_df) > 0:
+            if stats['total_apps'] > 0:
                 # Display statistics
                 col1, col2, col3, col4, col5 = st.columns(5)
                 with col1:
-                    st.metric("Total Apps", len(history_df))
+                    st.metric("Total Apps", stats['total_apps'])
                 with col2:
-                    unique_categories = history_df['categories'].nunique() if 'categories' in history_df.columns else 0
-                    st.metric("Unique Categories", unique_categories)
+                    st.metric("Unique Categories", stats['unique_categories'])
                 with col3:
-                    free_count = len(history_df[history_df['price'].str.contains('Free', case=False, na=False)]) if 'price' in history_df.columns else 0
-                    st.metric("Free Apps", free_count)
+                    st.metric("Free Apps", stats['free_apps'])
                 with col4:
-                    paid_count = len(history_df[history_df['price'].str.contains('Paid', case=False, na=False)]) if 'price' in history_df.columns else 0
-                    st.metric("Paid Apps", paid_count)
+                    st.metric("Paid Apps", stats['paid_apps'])
                 with col5:
-                    apps_with_ratings = history_df['average_rating'].notna().sum() if 'average_rating' in history_df.columns else 0
-                    st.metric("Apps with Ratings", apps_with_ratings)
+                    st.metric("Apps with Ratings", stats['apps_with_ratings'])
                 
                 st.divider()
                 
@@ -267,7 +660,7 @@ def main():
                 with filter_col1:
                     category_filter = st.selectbox(
                         "Filter by Category",
-                        options=["All"] + (history_df['categories'].unique().tolist() if 'categories' in history_df.columns else []),
+                        options=["All"] + _cached_categories(),
                         key="category_filter"
                     )
                 
@@ -285,263 +678,75 @@ def main():
                         key="name_filter"
                     )
                 
-                # Apply filters
-                filtered_df = history_df.copy()
-                
-                if category_filter != "All" and 'categories' in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df['categories'] == category_filter]
-                
-                if price_filter != "All" and 'price' in filtered_df.columns:
-                    if price_filter == "Free":
-                        filtered_df = filtered_df[filtered_df['price'].str.contains('Free', case=False, na=False)]
-                    elif price_filter == "Paid":
-                        filtered_df = filtered_df[filtered_df['price'].str.contains('Paid', case=False, na=False)]
-                
-                if search_filter and 'app_name' in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df['app_name'].str.contains(search_filter, case=False, na=False)]
+                # Apply filters (evaluated in SQLite)
+                filter_key = (
+                    category_filter if category_filter != "All" else None,
+                    price_filter if price_filter != "All" else None,
+                    search_filter or None
+                )
+                filtered_df = _cached_filtered_history(*filter_key)
                 
                 st.divider()
                 
                 # Display filtered table with delete options
                 st.subheader(f"📋 Apps ({len(filtered_df)} results)")
                 
-                # Prepare display DataFrame
-                display_df = filtered_df.copy()
-                
-                # Select columns to display (use numeric columns instead of text columns)
-                display_columns = ['app_name', 'app_id', 'categories', 'category_ranking', 'price', 'developer_name', 
-                                 'content_rating', 
-                                 # Use numeric columns instead of text columns
-                                 'average_rating_numeric',  # Instead of 'average_rating'
-                                 'rating_count_numeric',     # Instead of 'rating_count'
-                                 'downloads_numeric',        # Instead of 'downloads_worldwide'
-                                 'revenue_numeric',          # Instead of 'revenue_worldwide'
-                                 'release_date', 'publisher_country', 'last_updated', 'scraped_at']
+                # Only load and ship one page of rows to the browser
+                page = 1
+                page_count = max(1, math.ceil(len(filtered_df) / HISTORY_PAGE_SIZE))
+                if page_count > 1:
+                    # Keep the stored page in range when a filter shrinks the results
+                    if st.session_state.get("history_page", 1) > page_count:
+                        st.session_state["history_page"] = page_count
+                    page = st.number_input(
+                        f"Page (of {page_count})",
+                        min_value=1,
+                        max_value=page_count,
+                        step=1,
+                        key="history_page"
+                    )
                 
-                # Only show columns that exist in the DataFrame
-                available_columns = [col for col in display_columns if col in display_df.columns]
+                # Projected, renamed and formatted page (cached per filter combination and page)
+                display_table = _cached_display_history(*filter_key, page)
                 
                 # Debug: Check if numeric columns exist
-                missing_numeric = [col for col in ['average_rating_numeric', 'rating_count_numeric', 
-                                                   'downloads_numeric', 'revenue_numeric'] 
-                                  if col not in display_df.columns]
-                if missing_numeric and len(filtered_df) > 0:
+                missing_numeric = [col for col in NUMERIC_COLUMN_RENAMES.values() if col not in display_table.column_names]
+                if missing_numeric and display_table.num_rows > 0:
                     st.warning(f"⚠️ Some numeric columns are missing: {missing_numeric}. They may not be in the database yet.")
                 
-                # Select only the columns that exist
-                display_df = display_df[available_columns]
-                
-                # Rename numeric columns for cleaner display (remove "_numeric" suffix)
-                column_renames = {}
-                if 'average_rating_numeric' in display_df.columns:
-                    column_renames['average_rating_numeric'] = 'Rating'
-                if 'rating_count_numeric' in display_df.columns:
-                    column_renames['rating_count_numeric'] = 'Rating Count'
-                if 'downloads_numeric' in display_df.columns:
-                    column_renames['downloads_numeric'] = 'Downloads'
-                if 'revenue_numeric' in display_df.columns:
-                    column_renames['revenue_numeric'] = 'Revenue'
-                
-                # Only rename if we have columns to rename
-                if column_renames:
-                    try:
-                        display_df = display_df.rename(columns=column_renames)
-                        # Update available_columns list to reflect renamed columns
-                        for old_name, new_name in column_renames.items():
-                            if old_name in available_columns:
-                                idx = available_columns.index(old_name)
-                                available_columns[idx] = new_name
-                    except Exception as e:
-                        # If rename fails, just continue without renaming
-                        st.warning(f"Could not rename columns: {e}")
-                        pass
-                
-                # Format IAP column if exists
-                if 'in_app_purchases' in filtered_df.columns:
-                    display_df['in_app_purchases'] = filtered_df['in_app_purchases'].apply(format_iap_display)
-                
-                # After renaming, ensure we keep all columns (including renamed ones and IAP)
-                # Don't filter again - display_df already has the correct columns
-                
-                # Ensure numeric columns maintain their numeric type for proper sorting
-                numeric_cols_to_ensure = ['Rating', 'Rating Count', 'Downloads', 'Revenue',
-                                         'rating_count_numeric', 'average_rating_numeric', 
-                                         'downloads_numeric', 'revenue_numeric']
-                
-                for col in numeric_cols_to_ensure:
-                    if col in display_df.columns:
-                        display_df[col] = pd.to_numeric(display_df[col], errors='coerce')
-                
-                # Calculate Revenue / Download (ARPU - Average Revenue Per User)
-                # Handle division by zero and missing values
-                if 'Revenue' in display_df.columns and 'Downloads' in display_df.columns:
-                    display_df['Revenue / Download'] = display_df.apply(
-                        lambda row: (
-                            row['Revenue'] / row['Downloads'] 
-                            if pd.notna(row['Revenue']) and pd.notna(row['Downloads']) and row['Downloads'] > 0
-                            else None
-                        ),
-                        axis=1
-                    )
-                
-                # Display table with column configuration for proper numeric sorting and formatting
-                column_config = {}
-                for col in display_df.columns:
-                    # Format numeric columns with proper number formatting
-                    if col in ['Rating', 'Rating Count', 'Downloads', 'Revenue', 'Revenue / Download']:
-                        if col == 'Rating':
-                            # Rating: show 1 decimal place
-                            column_config[col] = st.column_config.NumberColumn(
-                                col,
-                                format="%.1f"
-                            )
-                        elif col == 'Revenue / Download':
-                            # Revenue per download: show 2 decimal places (currency-like)
-                            column_config[col] = st.column_config.NumberColumn(
-                                col,
-                                format="%.2f"
-                            )
-                        elif col in ['Rating Count', 'Downloads', 'Revenue']:
-                            # Large numbers: format with commas
-                            column_config[col] = st.column_config.NumberColumn(
-                                col,
-                                format="%d"
-                            )
+                # Column configuration for proper numeric sorting and formatting
+                column_config = {col: config for col, config in TABLE_COLUMN_CONFIG.items()
+                                 if col in display_table.column_names}
                 
                 # Display table
                 st.dataframe(
-                    display_df,
-                    use_container_width=True,
+                    display_table,
+                    width='stretch',
                     height=400,
                     hide_index=True,
                     column_config=column_config if column_config else None
                 )
                 
+                # App names shared by the Quick Delete and Detailed View selectors
+                app_names = filtered_df['app_name']
+                
                 # Quick delete section - show delete buttons for each row
                 if len(filtered_df) > 0:
-                    st.divider()
-                    st.subheader("🗑️ Quick Delete")
-                    st.caption("Select an app to delete quickly")
-                    
-                    # Create a selectbox for quick delete
-                    delete_options = [f"{row.get('app_name', 'Unknown')} (ID: {row.get('app_id', 'N/A')})" 
-                                     for idx, row in filtered_df.iterrows()]
-                    selected_delete = st.selectbox(
-                        "Select app to delete",
-                        options=delete_options,
-                        key="quick_delete_select"
-                    )
-                    
-                    if selected_delete:
-                        # Extract app_id from selection
-                        selected_idx = delete_options.index(selected_delete)
-                        selected_row = filtered_df.iloc[selected_idx]
-                        delete_app_id = selected_row.get('app_id', '')
-                        delete_app_name = selected_row.get('app_name', 'Unknown')
-                        
-                        delete_btn_col1, delete_btn_col2 = st.columns([3, 1])
-                        with delete_btn_col2:
-                            if st.button("🗑️ Delete Selected", type="secondary", use_container_width=True, 
-                                       key=f"quick_delete_{delete_app_id}"):
-                                if delete_app_id:
-                                    success = database.delete_app(delete_app_id)
-                                    if success:
-                                        st.success(f"✅ Deleted '{delete_app_name}' successfully!")
-                                        time.sleep(0.5)
-                                        st.rerun()
-                                    else:
-                                        st.error("❌ Failed to delete app. It may have already been deleted.")
-                                else:
-                                    st.error("❌ Cannot delete: No App ID found.")
+                    _quick_delete_section(filtered_df, app_names)
                 
                 # Detailed view for selected row
                 st.divider()
                 st.subheader("🔍 Detailed View")
                 
                 if len(filtered_df) > 0:
-                    selected_index = st.selectbox(
-                        "Select an app to view details",
-                        options=range(len(filtered_df)),
-                        format_func=lambda x: filtered_df.iloc[x]['app_name'] if 'app_name' in filtered_df.columns else f"App {x}"
-                    )
-                    
-                    selected_app = filtered_df.iloc[selected_index]
-                    
-                    # Delete button at the top
-                    delete_col1, delete_col2 = st.columns([3, 1])
-                    with delete_col2:
-                        app_id_to_delete = selected_app.get('app_id', '')
-                        app_name_to_delete = selected_app.get('app_name', 'Unknown')
-                        delete_key = f"delete_{app_id_to_delete}_{selected_index}"
-                        
-                        if st.button("🗑️ Delete", type="secondary", use_container_width=True, key=delete_key):
-                            # Confirmation dialog
-                            st.warning(f"⚠️ Are you sure you want to delete '{app_name_to_delete}'?")
-                            confirm_col1, confirm_col2 = st.columns(2)
-                            with confirm_col1:
-                                if st.button("✅ Yes, Delete", key=f"confirm_delete_{delete_key}"):
-                                    if app_id_to_delete:
-                                        success = database.delete_app(app_id_to_delete)
-                                        if success:
-                                            st.success(f"✅ Deleted '{app_name_to_delete}' successfully!")
-                                            time.sleep(0.5)
-                                            st.rerun()
-                                        else:
-                                            st.error("❌ Failed to delete app. Check console for errors.")
-                                    else:
-                                        st.error("❌ Cannot delete: No App ID found.")
-                            with confirm_col2:
-                                if st.button("❌ Cancel", key=f"cancel_delete_{delete_key}"):
-                                    st.rerun()
-                    
-                    detail_col1, detail_col2 = st.columns(2)
-                    
-                    with detail_col1:
-                        st.write("**Basic Information**")
-                        for col in ['app_name', 'app_id', 'categories', 'category_ranking', 'price', 'content_rating', 
-                                   'average_rating', 'rating_count', 'release_date', 'publisher_country', 'last_updated']:
-                            if col in selected_app and selected_app[col]:
-                                display_value = selected_app[col]
-                                # Format category ranking with # prefix if it's a number
-                                if col == 'category_ranking' and display_value and not str(display_value).startswith('#'):
-                                    display_value = f"#{display_value}"
-                                # Format rating display
-                                if col == 'average_rating' and display_value:
-                                    rating_count_val = selected_app.get('rating_count', '')
-                                    if rating_count_val:
-                                        display_value = f"{display_value} ⭐ ({rating_count_val} ratings)"
-                                    else:
-                                        display_value = f"{display_value} ⭐"
-                                elif col == 'rating_count':
-                                    # Skip rating_count as it's shown with average_rating
-                                    continue
-                                st.write(f"- **{col.replace('_', ' ').title()}:** {display_value}")
-                    
-                    with detail_col2:
-                        st.write("**Developer & Metrics**")
-                        for col in ['developer_name', 'developer_website', 'support_url', 
-                                   'downloads_worldwide', 'revenue_worldwide', 'top_countries']:
-                            if col in selected_app:
-                                st.write(f"- **{col.replace('_', ' ').title()}:** {selected_app[col]}")
-                    
-                    # In-App Purchases
-                    if 'in_app_purchases' in selected_app and selected_app['in_app_purchases']:
-                        st.write("**In-App Purchases:**")
-                        try:
-                            iap_data = json.loads(selected_app['in_app_purchases']) if isinstance(selected_app['in_app_purchases'], str) else selected_app['in_app_purchases']
-                            if isinstance(iap_data, list) and len(iap_data) > 0:
-                                iap_df = pd.DataFrame(iap_data)
-                                st.dataframe(iap_df, use_container_width=True)
-                            else:
-                                st.write("None")
-                        except:
-                            st.write(selected_app['in_app_purchases'])
+                    _detail_section(filtered_df, app_names)
             else:
                 st.info("📭 No apps scraped yet. Use the 'Search & Scrape' tab to get started!")
         
         except Exception as e:
             st.error(f"❌ Error loading history: {str(e)}")
-            st.exception(e)
+            if DEBUG:
+                st.exception(e)
     
     with tab2:
         st.header("Search for iOS App")
@@ -590,131 +795,158 @@ def main():
             # Check if multiple apps (comma-separated)
             batch_mode = ',' in search_term if search_term else False
         
+        if batch_mode and not direct_url:
+            max_workers = st.slider(
+                "Parallel Workers", 1, 20, 8,
+                help="Number of apps scraped concurrently in batch mode (each worker runs its own browser)"
+            )
+            if search_mode == "App ID":
+                force_refresh = st.checkbox(
+                    "Force refresh",
+                    value=False,
+                    help="Re-scrape App IDs that are already saved in the database"
+                )
+        
         col1, col2 = st.columns([3, 1])
         with col1:
-            scrape_button = st.button("🔍 Scrape", use_container_width=True, type="primary")
+            scrape_button = st.button("🔍 Scrape", width='stretch', type="primary")
         with col2:
             st.write("")  # Spacing
         
+        if scrape_button:
+            # A new scrape replaces the previous batch summary
+            st.session_state.pop('batch_summary', None)
+        elif 'batch_summary' in st.session_state:
+            render_batch_summary(st.session_state['batch_summary'])
+        
         if scrape_button and (search_term or app_id or direct_url):
             # Check if batch mode (multiple items separated by commas)
             if batch_mode and not direct_url:
                 # Parse comma-separated input
-                if search_mode == "App ID":
-                    items = [item.strip() for item in search_term.split(',') if item.strip()]
-                    item_type = "App ID"
-                else:
-                    items = [item.strip() for item in search_term.split(',') if item.strip()]
-                    item_type = "App Name"
+                raw_items = [item.strip() for item in search_term.split(',') if item.strip()]
+                item_type = "App ID" if search_mode == "App ID" else "App Name"
+                
+                # Drop repeated entries (case-insensitive) so each app is scraped once
+                seen = set()
+                items = []
+                for item in raw_items:
+                    if item.lower() not in seen:
+                        seen.add(item.lower())
+                        items.append(item)
+                
+                unique_count = len(items)
                 
-                if len(items) == 0:
+                # Skip App IDs that are already stored unless a refresh was requested
+                already_saved = 0
+                if search_mode == "App ID" and not force_refresh:
+                    existing_ids = database.get_existing_app_ids()
+                    items = [item for item in items if item not in existing_ids]
+                    already_saved = unique_count - len(items)
+                
+                if len(items) == 0 and already_saved:
+                    st.info(f"ℹ️ All {already_saved} App IDs are already in the database. Check 'Force refresh' to scrape them again.")
+                elif len(items) == 0:
                     st.warning("⚠️ Please enter at least one app name or ID.")
                 else:
                     st.info(f"📦 **Batch Mode**: Processing {len(items)} {item_type}(s)")
+                    if unique_count < len(raw_items):
+                        st.caption(f"Removed {len(raw_items) - unique_count} duplicate entries; {unique_count} unique items")
+                    if already_saved:
+                        st.caption(f"Skipped {already_saved} App IDs already in the database")
                     
                     # Process each item
                     results = []
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    for idx, item in enumerate(items):
-                        current_num = idx + 1
-                        total = len(items)
-                        progress_bar.progress(current_num / total)
-                        status_text.text(f"Processing {current_num}/{total}: {item}")
-                        
-                        try:
-                            # Get App ID if needed
-                            current_app_id = None
-                            current_search_term = None
+                    total = len(items)
+                    
+                    # Scraping is I/O bound, so run items concurrently; each worker
+                    # reuses one browser, and scraped apps are buffered and written
+                    # in one transaction afterwards
+                    scraped = []
+                    work_queue = queue.Queue()
+                    for item in items:
+                        work_queue.put(item)
+                    result_queue = queue.Queue()
+                    worker_count = min(max_workers, total)
+                    
+                    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                        workers = [
+                            executor.submit(run_batch_worker, work_queue, result_queue, search_mode, headless_mode)
+                            for _ in range(worker_count)
+                        ]
+                        done = 0
+                        last_update = 0.0
+                        while done < total:
+                            try:
+                                outcome = result_queue.get(timeout=1)
+                            except queue.Empty:
+                                if all(worker.done() for worker in workers) and result_queue.empty():
+                                    break
+                                continue
                             
-                            if search_mode == "App ID":
-                                if item.isdigit():
-                                    current_app_id = item
-                                    current_search_term = f"App ID: {item}"
-                                else:
-                                    st.warning(f"⚠️ Skipping '{item}': Not a valid App ID")
-                                    continue
-                            else:
-                                # Search Apple Store for App ID
-                                current_search_term = item
-                                current_app_id = scraper.get_app_id_from_apple(item, headless=headless_mode)
-                                if not current_app_id:
-                                    st.warning(f"⚠️ Skipping '{item}': Could not find App ID on Apple Store")
-                                    continue
+                            done += 1
+                            item = outcome['item']
+                            now = time.monotonic()
+                            if done == total or now - last_update > PROGRESS_UPDATE_INTERVAL:
+                                progress_bar.progress(done / total)
+                                status_text.text(f"Processed {done}/{total}: {item}")
+                                last_update = now
+                            
+                            if outcome['status'] == 'skipped':
+                                results.append({'item': item, 'status': 'skipped', 'error': outcome['error']})
+                                continue
                             
-                            # Scrape data
-                            app_data = scraper.scrape_app_data(
-                                current_search_term,
-                                headless=headless_mode,
-                                app_id=current_app_id
-                            )
+                            if outcome['status'] == 'error':
+                                results.append(outcome)
+                                continue
+                            
+                            app_data = outcome['app_data']
                             
-                            # Auto-save each result
                             if app_data.get('app_name') or app_data.get('app_id'):
-                                try:
-                                    database.init_db()
-                                    save_success = database.save_result(app_data)
-                                    if save_success:
-                                        results.append({
-                                            'item': item,
-                                            'status': 'success',
-                                            'app_name': app_data.get('app_name', 'Unknown'),
-                                            'app_id': app_data.get('app_id', 'N/A')
-                                        })
-                                    else:
-                                        results.append({
-                                            'item': item,
-                                            'status': 'save_failed',
-                                            'app_name': app_data.get('app_name', 'Unknown'),
-                                            'app_id': app_data.get('app_id', 'N/A')
-                                        })
-                                except Exception as e:
-                                    results.append({
-                                        'item': item,
-                                        'status': 'save_error',
-                                        'error': str(e)
-                                    })
+                                scraped.append((item, app_data))
                             else:
                                 results.append({
                                     'item': item,
                                     'status': 'no_data',
                                     'error': app_data.get('error', 'No app data found')
                                 })
-                        
-                        except Exception as e:
-                            results.append({
+                    
+                    # Auto-save all scraped results in a single transaction
+                    if scraped:
+                        status_text.text(f"Saving {len(scraped)} apps to database...")
+                        saved_rows = database.save_results_bulk([app_data for _, app_data in scraped])
+                        if saved_rows:
+                            _record_save(len(scraped))
+                        for item, app_data in scraped:
+                            result = {
                                 'item': item,
-                                'status': 'error',
-                                'error': str(e)
-                            })
+                                'status': 'success' if saved_rows else 'save_failed',
+                                'app_name': app_data.get('app_name', 'Unknown'),
+                                'app_id': app_data.get('app_id', 'N/A')
+                            }
+                            if not saved_rows:
+                                result['error'] = 'Failed to save to database'
+                            results.append(result)
                     
-                    # Show batch results summary
+                    # Clear the progress display
                     progress_bar.empty()
                     status_text.empty()
                     
-                    st.success(f"✅ Batch processing complete! Processed {len(items)} items")
-                    
-                    # Display results summary
+                    # Keep the summary in session state so it is still shown after
+                    # the rerun that refreshes the history
+                    st.session_state['batch_summary'] = {
+                        'processed': len(items),
+                        'results': results,
+                        'already_saved': already_saved,
+                        'duplicates': len(raw_items) - unique_count,
+                    }
                     success_count = sum(1 for r in results if r['status'] == 'success')
-                    failed_count = len(results) - success_count
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("✅ Successfully Saved", success_count)
-                    with col2:
-                        st.metric("❌ Failed", failed_count)
-                    
-                    # Show detailed results
-                    with st.expander("📊 Batch Results Details", expanded=True):
-                        for result in results:
-                            if result['status'] == 'success':
-                                st.success(f"✅ {result['item']} → {result['app_name']} (ID: {result['app_id']})")
-                            else:
-                                st.error(f"❌ {result['item']} → {result.get('error', 'Failed')}")
-                    
-                    # Refresh to show updated history
-                    time.sleep(1)
+                    skipped_count = sum(1 for r in results if r['status'] == 'skipped')
+                    failed_count = len(results) - success_count - skipped_count
+                    st.toast(f"Batch complete: {success_count} saved, {skipped_count} skipped, {failed_count} failed",
+                             icon="📦")
                     st.rerun()
             
             else:
@@ -728,12 +960,20 @@ def main():
                     step2 = st.empty()
                     step3 = st.empty()
                 
-                with st.spinner(f"Scraping data for '{search_display}'... This may take a moment."):
+                with st.spinner(f"Scraping data for '{search_display}'... This may take a moment."), \
+                        contextlib.ExitStack() as stack:
                     try:
+                        # One browser for both the App Store search and the SensorTower scrape
+                        try:
+                            browser = stack.enter_context(scraper.BrowserSession(headless=headless_mode)).browser
+                        except Exception as e:
+                            print(f"Could not start shared browser, launching one per step: {e}")
+                            browser = None
+                        
                         # Step 1: Get App ID from Apple Store (if needed)
                         if not app_id and not direct_url and search_term:
                             step1.info("🔍 Step 1: Searching Apple App Store...")
-                            app_id = scraper.get_app_id_from_apple(search_term, headless=headless_mode)
+                            app_id = resolve_app_id(search_term, headless=headless_mode, browser=browser)
                             if app_id:
                                 step1.success(f"✅ Step 1: Found App ID: {app_id}")
                                 step2.info("🔍 Step 2: Scraping SensorTower data...")
@@ -753,7 +993,8 @@ def main():
                             search_term if search_term else "direct", 
                             headless=headless_mode,
                             direct_url=direct_url,
-                            app_id=app_id
+                            app_id=app_id,
+                            browser=browser
                         )
                         
                         # Check for errors first
@@ -784,18 +1025,13 @@ def main():
                         save_error = None
                         if app_data.get('app_name') or app_data.get('app_id'):
                             try:
-                                database.init_db()
                                 with st.spinner("Auto-saving to database..."):
                                     save_success = database.save_result(app_data)
                                 if save_success:
-                                    # Verify it was saved
-                                    history_df = database.get_history()
-                                    if len(history_df) > 0:
-                                        auto_saved = True
-                                        step3.success(f"✅ Step 3: Auto-saved! (Total: {len(history_df)} records)")
-                                    else:
-                                        step3.warning("⚠️ Step 3: Auto-save verification failed")
-                                        save_error = "Save reported success but no records found"
+                                    # save_result() reports whether the row was written
+                                    saved_count = _record_save()
+                                    auto_saved = True
+                                    step3.success(f"✅ Step 3: Auto-saved! ({saved_count} saved this session)")
                                 else:
                                     step3.error("❌ Step 3: Auto-save failed")
                                     save_error = "Save function returned False"
@@ -859,8 +1095,7 @@ def main():
                             # In-App Purchases
                             if app_data.get('in_app_purchases'):
                                 st.subheader("In-App Purchases")
-                                iap_df = pd.DataFrame(app_data['in_app_purchases'])
-                                st.dataframe(iap_df, use_container_width=True)
+                                render_iap_table(app_data['in_app_purchases'])
                             else:
                                 st.write("**In-App Purchases:** None")
                             
@@ -872,60 +1107,49 @@ def main():
                         save_col1, save_col2 = st.columns([2, 1])
                         with save_col1:
                             if auto_saved:
-                                if st.button("💾 Re-save to Database", use_container_width=True):
+                                if st.button("💾 Re-save to Database", width='stretch'):
                                     try:
-                                        database.init_db()
                                         with st.spinner("Re-saving..."):
                                             success = database.save_result(app_data)
                                         if success:
-                                            history_df = database.get_history()
-                                            st.success(f"✅ Re-saved! Total records: {len(history_df)}")
-                                            time.sleep(0.5)
+                                            saved_count = _record_save()
+                                            st.toast(f"Re-saved! ({saved_count} saved this session)", icon="✅")
                                             st.rerun()
                                         else:
                                             st.error("❌ Re-save failed")
                                     except Exception as e:
                                         st.error(f"❌ Error: {str(e)}")
                             else:
-                                save_button_key = f"save_btn_{app_data.get('app_id', 'unknown')}_{hash(str(app_data))}"
-                                if st.button("💾 Save to Database", type="primary", use_container_width=True, key=save_button_key):
+                                save_button_key = f"save_btn_{app_data.get('app_id') or app_data.get('app_name', 'unknown')}"
+                                if st.button("💾 Save to Database", type="primary", width='stretch', key=save_button_key):
                                     # Check if we have at least app name or ID
                                     if app_data.get('app_name') or app_data.get('app_id'):
                                         try:
-                                            # Ensure database is initialized
-                                            database.init_db()
-                                            
                                             with st.spinner("Saving to database..."):
                                                 success = database.save_result(app_data)
                                             
                                             if success:
-                                                # Verify it was saved
-                                                history_df = database.get_history()
-                                                record_count = len(history_df)
-                                                
-                                                if record_count > 0:
-                                                    st.success(f"✅ App data saved successfully! Total records: {record_count}")
-                                                    time.sleep(0.5)
-                                                    st.rerun()
-                                                else:
-                                                    st.error("⚠️ Save reported success but database shows 0 records.")
-                                                    st.info("💡 Check console/terminal for detailed error messages")
+                                                saved_count = _record_save()
+                                                st.toast(f"App data saved successfully! ({saved_count} saved this session)", icon="✅")
+                                                st.rerun()
                                             else:
                                                 st.error("❌ Failed to save to database.")
                                                 st.info("💡 Check console/terminal for error details")
                                         except Exception as e:
                                             st.error(f"❌ Exception: {str(e)}")
-                                            with st.expander("🔧 Error Details"):
-                                                st.exception(e)
+                                            if DEBUG:
+                                                with st.expander("🔧 Error Details"):
+                                                    st.exception(e)
                                     else:
                                         st.warning("⚠️ Cannot save: No app name or ID found.")
                         with save_col2:
-                            if st.button("🔄 New Search", use_container_width=True):
+                            if st.button("🔄 New Search", width='stretch'):
                                 st.rerun()
                     
                     except Exception as e:
                         st.error(f"❌ An error occurred: {str(e)}")
-                        st.exception(e)
+                        if DEBUG:
+                            st.exception(e)
         
         elif scrape_button and not search_term:
             st.warning("⚠️ Please enter an app name or ID to search.")
@@ -4,12 +4,31 @@ Script to backfill missing rating data from Apple App Store for all apps in the
 """
 
 import database
-from database import get_history, save_result
+from database import save_results_bulk
 import scraper
 import pandas as pd
-import time
 from typing import Dict
 
+# Concurrent iTunes Lookup batch requests (Apple throttles aggressive clients)
+LOOKUP_WORKERS = 4
+
+# Updated rows are written in transactions of this many rows
+SAVE_BATCH_SIZE = 500
+
+def _flush(pending: list) -> tuple:
+    """Save the queued rows in one transaction and clear the queue. Returns (saved, failed)."""
+    if not pending:
+        return 0, 0
+    count = len(pending)
+    saved = save_results_bulk(pending)
+    pending.clear()
+    if saved:
+        print(f"\n💾 Saved {count} updated records")
+        return count, 0
+    print(f"\n❌ Failed to save {count} updated records")
+    return 0, count
+
+
 def backfill_ratings():
     """Backfill rating data for all apps missing ratings."""
     print("=" * 80)
@@ -19,22 +38,16 @@ def backfill_ratings():
     # Initialize database
     database.init_db()
     
-    # Get all records
-    df = get_history()
+    total_records = database.count_records()
     
-    if len(df) == 0:
+    if total_records == 0:
         print("No records found in database.")
         return
     
-    print(f"\nFound {len(df)} total records")
+    print(f"\nFound {total_records} total records")
     
-    # Find records with missing ratings
-    missing_ratings = df[
-        (df['average_rating'].isna()) | 
-        (df['average_rating'] == '') | 
-        (df['rating_count'].isna()) | 
-        (df['rating_count'] == '')
-    ]
+    # Find records with missing ratings (filtered in SQLite)
+    missing_ratings = database.get_apps_missing_ratings()
     
     print(f"Records with missing ratings: {len(missing_ratings)}")
     
@@ -48,35 +61,40 @@ def backfill_ratings():
     error_count = 0
     skipped_count = 0
     
+    pending = []
+    
+    # Skip rows without an App ID up front; the rest are looked up concurrently
+    to_lookup = []
     for idx, row in missing_ratings.iterrows():
-        app_name = row['app_name']
         app_id = row.get('app_id', '')
-        
-        print(f"\n[{idx + 1}/{len(missing_ratings)}] {app_name}")
-        print(f"  App ID: {app_id}")
-        
         if not app_id or pd.isna(app_id) or app_id == '':
+            print(f"\n{row['app_name']}")
             print(f"  ⚠️ Skipping: No App ID")
             skipped_count += 1
             continue
+        to_lookup.append(row)
+    
+    # Apple's iTunes Lookup API returns the ratings as JSON for up to 200 apps
+    # per request, so no browser is needed
+    lookups = scraper.lookup_apple_metadata_batch([row['app_id'] for row in to_lookup],
+                                                  max_workers=LOOKUP_WORKERS)
+    
+    for position, row in enumerate(to_lookup, start=1):
+        apple_data = lookups[str(row['app_id']).strip()]
+        app_name = row['app_name']
+        app_id = row.get('app_id', '')
         
-        # Construct Apple App Store URL
-        apple_url = f"https://apps.apple.com/us/app/id{app_id}"
+        print(f"\n[{position}/{len(to_lookup)}] {app_name}")
+        print(f"  App ID: {app_id}")
         
         try:
-            # Scrape Apple App Store data
-            print(f"  Scraping: {apple_url}")
-            apple_data = scraper.scrape_apple_app_store(apple_url, headless=True, timeout=30000)
-            
             if apple_data.get('error'):
                 print(f"  ❌ Error: {apple_data.get('error')}")
                 error_count += 1
                 continue
             
             # Get existing app data
-            existing_data = {}
-            for col in df.columns:
-                existing_data[col] = row.get(col)
+            existing_data = row.to_dict()
             
             # Update with rating data
             rating_added = False
@@ -88,30 +106,30 @@ def backfill_ratings():
                 rating_added = True
             
             if rating_added:
-                # Save updated data
-                success = save_result(existing_data)
+                # Queue updated data; it is written in batches below
+                pending.append(existing_data)
+                rating_display = apple_data.get('average_rating', 'N/A')
+                count_display = apple_data.get('rating_count', 'N/A')
+                print(f"  ✅ Found: {rating_display} ⭐ ({count_display} ratings)")
                 
-                if success:
-                    rating_display = apple_data.get('average_rating', 'N/A')
-                    count_display = apple_data.get('rating_count', 'N/A')
-                    print(f"  ✅ Updated: {rating_display} ⭐ ({count_display} ratings)")
-                    success_count += 1
-                else:
-                    print(f"  ❌ Failed to save rating data")
-                    error_count += 1
+                if len(pending) >= SAVE_BATCH_SIZE:
+                    saved, failed = _flush(pending)
+                    success_count += saved
+                    error_count += failed
             else:
                 print(f"  ⚠️ No rating data found on Apple App Store")
                 error_count += 1
             
-            # Be nice to Apple's servers - add a small delay
-            time.sleep(2)
-            
         except Exception as e:
             print(f"  ❌ Exception: {str(e)}")
             import traceback
             traceback.print_exc()
             error_count += 1
-            time.sleep(1)
+    
+    # Write whatever is left in one last transaction
+    saved, failed = _flush(pending)
+    success_count += saved
+    error_count += failed
     
     print("\n" + "=" * 80)
     print("Summary:")
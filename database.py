@@ -4,13 +4,31 @@ Uses SQLite to store scraped app information.
 """
 
 import sqlite3
+import contextlib
+import functools
 import json
+import logging
+import os
 import re
+import threading
+import time
+import zlib
 import pandas as pd
 from datetime import datetime
 from typing import Dict, Optional, List
 
 
+# Multipliers for the K/M/B unit suffixes on scraped values
+_UNIT_MULTIPLIERS = {'K': 1000, 'M': 1000000, 'B': 1000000000}
+
+
+def _skip_spaces(text: str, pos: int) -> int:
+    """Return the index of the first non-whitespace character at or after pos."""
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
+
+
 def convert_text_to_number(text_value):
     """
     Convert text values like '8.2K', '134K', '13M', '200k', '< $5k' to plain numbers.
@@ -34,56 +52,218 @@ def convert_text_to_number(text_value):
     if not text or text.lower() in ['n/a', 'none', '']:
         return None
     
-    # Check for "< 5k" or "< $5k" patterns - these mean less than 5000, so return 0
-    if re.match(r'^[<]\s*\$?\s*5\s*[kK]', text, re.IGNORECASE):
-        return 0
+    # Skip a leading '<', '>' or '=' and an optional '$', each possibly followed by spaces
+    pos = _skip_spaces(text, 1 if text[0] in '<>=' else 0)
+    if text.startswith('$', pos):
+        pos = _skip_spaces(text, pos + 1)
     
-    # Check for "< 5k" in downloads/revenue context
-    if re.match(r'^[<]\s*\$?\s*5', text, re.IGNORECASE):
+    # "< 5k" or "< $5k" mean less than 5000, so return 0
+    if text[0] == '<' and text.startswith('5', pos):
         return 0
     
-    # Remove common prefixes like '< $', '$', etc. (but we already handled < 5k above)
-    text = re.sub(r'^[<>=]?\s*\$?\s*', '', text, flags=re.IGNORECASE)
-    
-    # Extract number and unit
-    # Match patterns like: "8.2K", "134K", "13M", "200k", "5k", etc.
-    match = re.match(r'([\d.]+)\s*([KMBkmb]?)', text, re.IGNORECASE)
+    # Scan the leading number, e.g. "8.2" in "8.2K"
+    number_start = pos
+    while pos < len(text) and (text[pos].isdecimal() or text[pos] == '.'):
+        pos += 1
     
-    if not match:
+    if pos == number_start:
         # Try to extract just a number if no unit
         try:
-            return float(text.replace(',', ''))
-        except:
+            return float(text[number_start:].replace(',', ''))
+        except ValueError:
             return None
     
-    number_str = match.group(1)
-    unit = match.group(2).upper() if match.group(2) else ''
+    number_str = text[number_start:pos]
+    pos = _skip_spaces(text, pos)
+    multiplier = _UNIT_MULTIPLIERS.get(text[pos].upper()) if pos < len(text) else None
     
     try:
         number = float(number_str)
-        
-        # Multiply based on unit
-        if unit == 'K':
-            return int(number * 1000)
-        elif unit == 'M':
-            return int(number * 1000000)
-        elif unit == 'B':
-            return int(number * 1000000000)
-        else:
-            # No unit, return as-is
-            return int(number) if number.is_integer() else number
-    except:
+    except ValueError:
         return None
+    
+    if multiplier:
+        return int(number * multiplier)
+    # No unit, return as-is
+    return int(number) if number.is_integer() else number
+
+
+def convert_text_column_to_number(values: pd.Series) -> pd.Series:
+    """
+    Vectorized convert_text_to_number() for a whole column.
+    
+    Applies the same rules with pandas string operations instead of calling
+    the per-value function for every row. Missing or unparseable values
+    become NaN.
+    """
+    text = values.astype('string').str.strip()
+    text = text.mask(text.str.lower().isin(['n/a', 'none', '']))
+    
+    # "< 5k" / "< $5k" mean less than 5000, so they become 0
+    below_5k = text.str.match(r'^<\s*\$?\s*5', na=False)
+    
+    # Remove common prefixes like '< $', '$', etc. and split number and unit
+    text = text.str.replace(r'^[<>=]?\s*\$?\s*', '', regex=True)
+    parts = text.str.extract(r'^([\d.]+)\s*([KMBkmb]?)')
+    number = pd.to_numeric(parts[0], errors='coerce')
+    multiplier = parts[1].str.upper().map(_UNIT_MULTIPLIERS)
+    # Values with a unit are truncated to whole numbers, like int() in the scalar version
+    scaled = (number * multiplier.astype('float64')).where(multiplier.notna(), number)
+    scaled = scaled.where(multiplier.isna(), scaled // 1)
+    
+    # No leading number: try the whole text as a plain (comma separated) number
+    plain = pd.to_numeric(text.str.replace(',', '', regex=False), errors='coerce')
+    result = scaled.where(parts[0].notna(), plain).astype('float64')
+    return result.mask(below_5k, 0)
+
+
+def format_iap_display(iap_json) -> str:
+    """Format in-app purchases (JSON string or list) for display, one item per line."""
+    if not iap_json:
+        return "None"
+    
+    if isinstance(iap_json, list):
+        iap_list = iap_json
+    elif isinstance(iap_json, str):
+        # Only strings that look like JSON are worth handing to the parser
+        if iap_json.lstrip()[:1] not in ('[', '{'):
+            return iap_json
+        try:
+            iap_list = json.loads(iap_json)
+        except json.JSONDecodeError:
+            return iap_json
+    else:
+        return "None"
+    
+    if not isinstance(iap_list, list) or len(iap_list) == 0:
+        return "None"
+    
+    formatted = []
+    for item in iap_list:
+        if not isinstance(item, dict):
+            return str(iap_json)
+        title = item.get('title', 'N/A')
+        duration = item.get('duration', 'N/A')
+        price = item.get('price', 'N/A')
+        formatted.append(f"{title} ({duration}): {price}")
+    return "\n".join(formatted)
 
 
 DB_NAME = "history.db"
 
+# Per-call save/delete details are debug logs; errors are still printed
+logger = logging.getLogger(__name__)
+
+# SQLite allows a single writer at a time; serialize writes from worker threads.
+# Readers are not blocked thanks to WAL mode (enabled in init_db).
+_write_lock = threading.Lock()
+
+# Prepared statements kept per connection by the sqlite3 module (default 128)
+STATEMENT_CACHE_SIZE = 256
+
+
+def _connect(read_only: bool = False) -> sqlite3.Connection:
+    """Open a database connection with the per-connection performance PRAGMAs applied."""
+    # Connections are long-lived, so a larger statement cache keeps every query's
+    # compiled form around instead of re-preparing the SQL on each call
+    if read_only:
+        conn = sqlite3.connect(f"file:{DB_NAME}?mode=ro", uri=True, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+    else:
+        conn = sqlite3.connect(DB_NAME, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+
+# Reads use one read-only connection per thread, opened on first use and kept
+# for the life of the thread so repeated queries skip the open cost and reuse
+# SQLite's page cache
+_local = threading.local()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Return this thread's read-only database connection, opening it if needed."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        # A read-only open fails if the file doesn't exist yet, so make sure
+        # the schema has been created first
+        init_db()
+        conn = _local.conn = _connect(read_only=True)
+    return conn
+
+
+# All writes go through one shared connection, only used while holding _write_lock
+_writer = None
+
+
+def _get_writer() -> sqlite3.Connection:
+    """Return the shared write connection; callers must hold _write_lock."""
+    global _writer
+    if _writer is None:
+        _writer = _connect()
+    return _writer
+
+
+# Bumped after every write transaction; part of the get_history() cache key
+_write_generation = 0
+
+
+@contextlib.contextmanager
+def _write_transaction():
+    """Hold the write lock and yield a writer cursor inside one transaction (rolled back on error)."""
+    global _write_generation
+    with _write_lock:
+        conn = _get_writer()
+        try:
+            with conn:
+                yield conn.cursor()
+        finally:
+            _write_generation += 1
+
+
+# Set once init_db() has run, so later calls skip the schema and migration checks
+_initialized = False
+
 
 def init_db():
     """Initialize the database and create the apps table if it doesn't exist."""
-    conn = sqlite3.connect(DB_NAME)
+    global _initialized
+    if _initialized:
+        return
+    
+    with _write_lock:
+        if not _initialized:
+            _create_schema(_get_writer())
+            _initialized = True
+
+
+# Columns added after the first version of the table, with their types. New
+# tables are created with them; older databases get them added by init_db()
+MIGRATED_COLUMNS = {
+    'category_ranking': 'TEXT',
+    'average_rating': 'TEXT',
+    'rating_count': 'TEXT',
+    'rating_count_numeric': 'INTEGER',
+    'average_rating_numeric': 'REAL',
+    'downloads_numeric': 'INTEGER',
+    'revenue_numeric': 'INTEGER',
+    'release_date': 'TEXT',
+    'in_app_purchases_text': 'TEXT',
+}
+
+
+def _create_schema(conn: sqlite3.Connection):
+    """Create the apps table, run column migrations and build indexes."""
     cursor = conn.cursor()
     
+    # WAL lets readers proceed while a write is in progress (persisted in the file)
+    journal_mode = cursor.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    if journal_mode.lower() != 'wal':
+        print(f"Warning: could not enable WAL mode, using journal_mode={journal_mode}")
+    
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS apps (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -103,62 +283,264 @@ def init_db():
             publisher_country TEXT,
             category_ranking TEXT,
             in_app_purchases TEXT,
-            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            in_app_purchases_text TEXT,
+            average_rating TEXT,
+            rating_count TEXT,
+            rating_count_numeric INTEGER,
+            average_rating_numeric REAL,
+            downloads_numeric INTEGER,
+            revenue_numeric INTEGER,
+            release_date TEXT,
+            scraped_at INTEGER DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
             UNIQUE(app_id, app_name)
         )
     """)
     
-    # Migrate existing tables to add new columns if they don't exist
+    # Migrate existing tables: add any missing columns and fill in the derived
+    # ones inside one transaction, so the whole migration commits once
     try:
         cursor.execute("PRAGMA table_info(apps)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'category_ranking' not in columns:
-            cursor.execute("ALTER TABLE apps ADD COLUMN category_ranking TEXT")
-            conn.commit()
-            print("Added category_ranking column to existing database")
-        
-        if 'average_rating' not in columns:
-            cursor.execute("ALTER TABLE apps ADD COLUMN average_rating TEXT")
-            conn.commit()
-            print("Added average_rating column to existing database")
+        columns = {column[1] for column in cursor.fetchall()}
+        missing = [name for name in MIGRATED_COLUMNS if name not in columns]
         
-        if 'rating_count' not in columns:
-            cursor.execute("ALTER TABLE apps ADD COLUMN rating_count TEXT")
-            conn.commit()
-            print("Added rating_count column to existing database")
+        cursor.execute("BEGIN")
+        for name in missing:
+            cursor.execute(f"ALTER TABLE apps ADD COLUMN {name} {MIGRATED_COLUMNS[name]}")
+        if missing:
+            print(f"Added columns to existing database: {', '.join(missing)}")
         
-        # Add numeric columns for sorting and calculations
-        if 'rating_count_numeric' not in columns:
-            cursor.execute("ALTER TABLE apps ADD COLUMN rating_count_numeric INTEGER")
-            conn.commit()
-            print("Added rating_count_numeric column to existing database")
+        # Rows saved before the numeric columns existed get them filled in once
+        # here, so readers never need to convert the text columns themselves
+        numeric_columns = ['rating_count_numeric', 'average_rating_numeric', 'downloads_numeric', 'revenue_numeric']
+        if any(col in missing for col in numeric_columns):
+            legacy = pd.read_sql_query(
+                "SELECT id, rating_count, average_rating, downloads_worldwide, revenue_worldwide FROM apps", conn
+            )
+            numeric = _numeric_columns(legacy)
+            # NaN becomes NULL; whole numbers go into the INTEGER columns as ints
+            backfill = list(zip(
+                *(numeric[col].astype(object).where(numeric[col].notna(), None) for col in numeric_columns),
+                legacy['id'].tolist()
+            ))
+            cursor.executemany("""
+                UPDATE apps SET rating_count_numeric = ?, average_rating_numeric = ?,
+                                downloads_numeric = ?, revenue_numeric = ?
+                WHERE id = ?
+            """, backfill)
+            print(f"Filled numeric columns for {len(backfill)} existing rows")
         
-        if 'average_rating_numeric' not in columns:
-            cursor.execute("ALTER TABLE apps ADD COLUMN average_rating_numeric REAL")
-            conn.commit()
-            print("Added average_rating_numeric column to existing database")
+        # Pre-rendered in-app purchases text, so readers don't re-parse the JSON
+        if 'in_app_purchases_text' in missing:
+            cursor.execute("SELECT id, in_app_purchases FROM apps")
+            backfill = [(format_iap_display(decode_iap(iap)), row_id) for row_id, iap in cursor.fetchall()]
+            cursor.executemany("UPDATE apps SET in_app_purchases_text = ? WHERE id = ?", backfill)
         
-        if 'downloads_numeric' not in columns:
-            cursor.execute("ALTER TABLE apps ADD COLUMN downloads_numeric INTEGER")
-            conn.commit()
-            print("Added downloads_numeric column to existing database")
-        
-        if 'revenue_numeric' not in columns:
-            cursor.execute("ALTER TABLE apps ADD COLUMN revenue_numeric INTEGER")
-            conn.commit()
-            print("Added revenue_numeric column to existing database")
+        # scraped_at used to be a local-time ISO string; store it as epoch milliseconds
+        cursor.execute("""
+            UPDATE apps
+            SET scraped_at = CAST(ROUND((julianday(scraped_at, 'utc') - 2440587.5) * 86400000) AS INTEGER)
+            WHERE typeof(scraped_at) = 'text' AND julianday(scraped_at) IS NOT NULL
+        """)
+        if cursor.rowcount > 0:
+            print(f"Converted scraped_at to epoch milliseconds for {cursor.rowcount} rows")
         
-        if 'release_date' not in columns:
-            cursor.execute("ALTER TABLE apps ADD COLUMN release_date TEXT")
-            conn.commit()
-            print("Added release_date column to existing database")
-            
+        conn.commit()
     except Exception as e:
-        print(f"Migration check error (may be OK if table is new): {e}")
+        conn.rollback()
+        print(f"Migration error, no changes were applied: {e}")
+    
+    # Indexes for the Database tab's category filter and newest-first ordering.
+    # idx_apps_recent also holds app_id/app_name, so the app selector list
+    # (id, app_id, app_name newest first) is read from the index alone; it
+    # replaces the older scraped_at-only index, which is a prefix of it
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_apps_categories ON apps(categories)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_apps_recent ON apps(scraped_at, id, app_id, app_name)")
+    cursor.execute("DROP INDEX IF EXISTS idx_apps_scraped_at")
+    # Lookups and deletes by name; app_id lookups already use the UNIQUE(app_id, app_name) index
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_apps_app_name ON apps(app_name)")
     
     conn.commit()
-    conn.close()
+
+
+# Upsert keyed on UNIQUE(app_id, app_name): an existing row is updated in place,
+# keeping its id, instead of being deleted and re-inserted
+INSERT_APP_SQL = """
+    INSERT INTO apps (
+        app_name, app_id, categories, price, top_countries,
+        advertised_status, support_url, developer_website,
+        developer_name, content_rating, downloads_worldwide,
+        revenue_worldwide, last_updated, publisher_country,
+        category_ranking, in_app_purchases, in_app_purchases_text,
+        average_rating, rating_count, rating_count_numeric,
+        average_rating_numeric, downloads_numeric, revenue_numeric,
+        release_date, scraped_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(app_id, app_name) DO UPDATE SET
+        categories = excluded.categories,
+        price = excluded.price,
+        top_countries = excluded.top_countries,
+        advertised_status = excluded.advertised_status,
+        support_url = excluded.support_url,
+        developer_website = excluded.developer_website,
+        developer_name = excluded.developer_name,
+        content_rating = excluded.content_rating,
+        downloads_worldwide = excluded.downloads_worldwide,
+        revenue_worldwide = excluded.revenue_worldwide,
+        last_updated = excluded.last_updated,
+        publisher_country = excluded.publisher_country,
+        category_ranking = excluded.category_ranking,
+        in_app_purchases = excluded.in_app_purchases,
+        in_app_purchases_text = excluded.in_app_purchases_text,
+        average_rating = excluded.average_rating,
+        rating_count = excluded.rating_count,
+        rating_count_numeric = excluded.rating_count_numeric,
+        average_rating_numeric = excluded.average_rating_numeric,
+        downloads_numeric = excluded.downloads_numeric,
+        revenue_numeric = excluded.revenue_numeric,
+        release_date = excluded.release_date,
+        scraped_at = excluded.scraped_at
+"""
+
+
+def decode_iap(value):
+    """
+    Return a stored in-app purchases value as JSON text.
+    
+    New rows store the JSON zlib-compressed as a BLOB; rows saved before
+    that hold plain text and are returned unchanged.
+    """
+    if isinstance(value, bytes):
+        try:
+            return zlib.decompress(value).decode('utf-8')
+        except (zlib.error, UnicodeDecodeError):
+            return None
+    return value
+
+
+def _record_dict(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+    """Convert a fetched apps row to a dict with the in-app purchases decoded."""
+    if row is None:
+        return None
+    record = dict(row)
+    record['in_app_purchases'] = decode_iap(record.get('in_app_purchases'))
+    return record
+
+
+# Deletes every ASCII character except digits and '.', plus the star symbols
+# seen in scraped ratings, so '4.5 ⭐' -> '4.5' without running a regex
+_RATING_STRIP_TABLE = str.maketrans(
+    '', '', ''.join(chr(c) for c in range(128) if not (chr(c).isdigit() or chr(c) == '.')) + '⭐★☆\ufe0f'
+)
+_RE_NON_RATING_CHARS = re.compile(r'[^\d.]')
+
+
+def _numeric_values(data: Dict) -> tuple:
+    """
+    Derive the numeric columns from an app's text values.
+    
+    Returns:
+        (rating_count_numeric, average_rating_numeric, downloads_numeric, revenue_numeric)
+    """
+    # Convert text values to numbers for sorting/calculations
+    rating_count_numeric = convert_text_to_number(data.get('rating_count', ''))
+    downloads_numeric = convert_text_to_number(data.get('downloads_worldwide', ''))
+    revenue_numeric = convert_text_to_number(data.get('revenue_worldwide', ''))
+    
+    # Special handling: SensorTower uses "5k" to mean "< 5k" for downloads
+    # If downloads text is exactly "5k" (without "<"), treat it as 0
+    downloads_text = str(data.get('downloads_worldwide', '')).strip().lower()
+    if downloads_text == '5k' and downloads_numeric == 5000:
+        downloads_numeric = 0
+    
+    # Convert average_rating to numeric (remove star emoji if present)
+    avg_rating_text = data.get('average_rating', '')
+    average_rating_numeric = None
+    if avg_rating_text:
+        try:
+            # Remove non-numeric characters except decimal point; anything
+            # non-ASCII the table doesn't cover falls back to the regex
+            avg_rating_text = str(avg_rating_text)
+            avg_rating_clean = avg_rating_text.translate(_RATING_STRIP_TABLE)
+            if not avg_rating_clean.isascii():
+                avg_rating_clean = _RE_NON_RATING_CHARS.sub('', avg_rating_text)
+            if avg_rating_clean:
+                average_rating_numeric = float(avg_rating_clean)
+        except (TypeError, ValueError):
+            pass
+    
+    return rating_count_numeric, average_rating_numeric, downloads_numeric, revenue_numeric
+
+
+def _numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized _numeric_values() for many stored rows at once.
+    
+    Args:
+        df: DataFrame with rating_count, average_rating, downloads_worldwide
+            and revenue_worldwide text columns
+    
+    Returns:
+        DataFrame with the four *_numeric columns (NaN where not parseable)
+    """
+    downloads = convert_text_column_to_number(df['downloads_worldwide'])
+    # Special handling: SensorTower uses "5k" to mean "< 5k" for downloads
+    exactly_5k = df['downloads_worldwide'].astype('string').str.strip().str.lower().eq('5k').fillna(False)
+    downloads = downloads.mask(exactly_5k & downloads.eq(5000), 0)
+    
+    # Remove non-numeric characters (e.g. star emoji) except the decimal point
+    rating_clean = df['average_rating'].astype('string').str.replace(r'[^\d.]', '', regex=True)
+    
+    return pd.DataFrame({
+        'rating_count_numeric': convert_text_column_to_number(df['rating_count']),
+        'average_rating_numeric': pd.to_numeric(rating_clean, errors='coerce'),
+        'downloads_numeric': downloads,
+        'revenue_numeric': convert_text_column_to_number(df['revenue_worldwide']),
+    }, index=df.index)
+
+
+def _prepare_row(data: Dict) -> tuple:
+    """
+    Build the INSERT_APP_SQL parameter tuple for one app, including the
+    derived numeric and pre-rendered columns.
+    """
+    # Convert in-app purchases list to JSON string if present
+    iap_json = None
+    if 'in_app_purchases' in data and data['in_app_purchases']:
+        if isinstance(data['in_app_purchases'], list):
+            iap_json = json.dumps(data['in_app_purchases'])
+        else:
+            iap_json = str(data['in_app_purchases'])
+    iap_text = format_iap_display(iap_json)
+    
+    rating_count_numeric, average_rating_numeric, downloads_numeric, revenue_numeric = _numeric_values(data)
+    
+    return (
+        data.get('app_name', 'Unknown'),
+        data.get('app_id', ''),
+        data.get('categories', ''),
+        data.get('price', ''),
+        data.get('top_countries', ''),
+        data.get('advertised_status', ''),
+        data.get('support_url', ''),
+        data.get('developer_website', ''),
+        data.get('developer_name', ''),
+        data.get('content_rating', ''),
+        data.get('downloads_worldwide', ''),
+        data.get('revenue_worldwide', ''),
+        data.get('last_updated', ''),
+        data.get('publisher_country', ''),
+        data.get('category_ranking', ''),
+        zlib.compress(iap_json.encode('utf-8')) if iap_json else None,  # read back via decode_iap()
+        iap_text,
+        data.get('average_rating', ''),
+        data.get('rating_count', ''),
+        rating_count_numeric,
+        average_rating_numeric,
+        downloads_numeric,
+        revenue_numeric,
+        data.get('release_date', ''),
+        time.time_ns() // 1000000
+    )
 
 
 def save_result(data: Dict) -> bool:
@@ -172,135 +554,311 @@ def save_result(data: Dict) -> bool:
         True if successful, False otherwise
     """
     try:
-        # Ensure database is initialized
+        # Ensure database is initialized (a no-op after the first call)
         init_db()
         
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        
-        # Convert in-app purchases list to JSON string if present
-        iap_json = None
-        if 'in_app_purchases' in data and data['in_app_purchases']:
-            if isinstance(data['in_app_purchases'], list):
-                iap_json = json.dumps(data['in_app_purchases'])
-            else:
-                iap_json = str(data['in_app_purchases'])
-        
         # Prepare data for insertion
-        app_name = data.get('app_name', 'Unknown')
-        app_id = data.get('app_id', '')
+        row = _prepare_row(data)
         
-        # Convert text values to numbers for sorting/calculations
-        rating_count_numeric = convert_text_to_number(data.get('rating_count', ''))
-        downloads_numeric = convert_text_to_number(data.get('downloads_worldwide', ''))
-        revenue_numeric = convert_text_to_number(data.get('revenue_worldwide', ''))
+        with _write_transaction() as cursor:
+            cursor.execute(INSERT_APP_SQL, row)
+            rows_affected = cursor.rowcount
         
-        # Special handling: SensorTower uses "5k" to mean "< 5k" for downloads
-        # If downloads text is exactly "5k" (without "<"), treat it as 0
-        downloads_text = str(data.get('downloads_worldwide', '')).strip().lower()
-        if downloads_text == '5k' and downloads_numeric == 5000:
-            downloads_numeric = 0
+        logger.debug("Saved app_name=%s, app_id=%s (rows affected: %s)",
+                     data.get('app_name', 'Unknown'), data.get('app_id', ''), rows_affected)
         
-        # Convert average_rating to numeric (remove star emoji if present)
-        avg_rating_text = data.get('average_rating', '')
-        average_rating_numeric = None
-        if avg_rating_text:
-            try:
-                # Remove non-numeric characters except decimal point
-                avg_rating_clean = re.sub(r'[^\d.]', '', str(avg_rating_text))
-                if avg_rating_clean:
-                    average_rating_numeric = float(avg_rating_clean)
-            except:
-                pass
-        
-        # Debug: Print what we're trying to save
-        print(f"Attempting to save: app_name={app_name}, app_id={app_id}")
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO apps (
-                app_name, app_id, categories, price, top_countries,
-                advertised_status, support_url, developer_website,
-                developer_name, content_rating, downloads_worldwide,
-                revenue_worldwide, last_updated, publisher_country,
-                category_ranking, in_app_purchases, average_rating,
-                rating_count, rating_count_numeric, average_rating_numeric,
-                downloads_numeric, revenue_numeric, release_date, scraped_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            app_name,
-            app_id,
-            data.get('categories', ''),
-            data.get('price', ''),
-            data.get('top_countries', ''),
-            data.get('advertised_status', ''),
-            data.get('support_url', ''),
-            data.get('developer_website', ''),
-            data.get('developer_name', ''),
-            data.get('content_rating', ''),
-            data.get('downloads_worldwide', ''),
-            data.get('revenue_worldwide', ''),
-            data.get('last_updated', ''),
-            data.get('publisher_country', ''),
-            data.get('category_ranking', ''),
-            iap_json,
-            data.get('average_rating', ''),
-            data.get('rating_count', ''),
-            rating_count_numeric,
-            average_rating_numeric,
-            downloads_numeric,
-            revenue_numeric,
-            data.get('release_date', ''),
-            datetime.now().isoformat()
-        ))
-        
-        conn.commit()
-        rows_affected = cursor.rowcount
+        # The upsert reports the row it inserted or updated, so a positive count means it is stored
+        return rows_affected > 0
+    except Exception as e:
+        import traceback
+        error_msg = f"Error saving to database: {e}\n{traceback.format_exc()}"
+        print(error_msg)
+        return False
+
+
+def save_results_bulk(rows: List[Dict]) -> int:
+    """
+    Save or update multiple apps in a single transaction.
+    
+    Args:
+        rows: List of dictionaries containing app information
         
-        # Verify the save by querying
-        cursor.execute("SELECT COUNT(*) FROM apps WHERE app_id = ? OR app_name = ?", (app_id, app_name))
-        verify_count = cursor.fetchone()[0]
+    Returns:
+        Number of rows written (0 if the transaction failed)
+    """
+    if not rows:
+        return 0
+    
+    try:
+        init_db()
         
-        conn.close()
+        params = [_prepare_row(data) for data in rows]
         
-        print(f"Save completed. Rows affected: {rows_affected}, Verified count: {verify_count}")
+        with _write_transaction() as cursor:
+            cursor.executemany(INSERT_APP_SQL, params)
+            rows_affected = cursor.rowcount
         
-        # Return True only if we can verify the record exists
-        return verify_count > 0
+        logger.debug("Bulk saved %s apps", rows_affected)
+        return rows_affected
     except Exception as e:
         import traceback
-        error_msg = f"Error saving to database: {e}\n{traceback.format_exc()}"
-        print(error_msg)
-        return False
+        print(f"Error bulk saving to database: {e}\n{traceback.format_exc()}")
+        return 0
+
+
+# Time zone used to show scraped_at (stored as UTC epoch milliseconds) as local time
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+
+def scraped_at_to_datetime(values: pd.Series) -> pd.Series:
+    """Convert stored scraped_at epoch milliseconds to naive local datetimes."""
+    millis = pd.to_numeric(values, errors='coerce')
+    return pd.to_datetime(millis, unit='ms', utc=True).dt.tz_convert(_LOCAL_TZ).dt.tz_localize(None)
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
 
+def _db_signature() -> tuple:
+    """
+    Describe the current state of the database files.
+    
+    Commits in WAL mode land in the -wal file and only reach the main file at
+    checkpoints, so both files' modification time and size are included, plus
+    a counter of writes made by this process.
+    """
+    signature = [_write_generation]
+    for path in (DB_NAME, DB_NAME + '-wal'):
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
 
-def get_history() -> pd.DataFrame:
+
+@functools.lru_cache(maxsize=4)
+def _history_snapshot(signature: tuple, columns: Optional[tuple]) -> pd.DataFrame:
+    """Read the history once per database state and column selection."""
+    return query_history(columns=list(columns) if columns else None)
+
+
+def get_history(columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Retrieve all app records from the database as a pandas DataFrame.
     Converts numeric columns to proper numeric types for sorting.
     
+    The result is reused until the database files change, so repeated calls
+    without writes in between skip the query.
+    
+    Args:
+        columns: Columns to select (all columns if None)
+    
     Returns:
         DataFrame containing all app records with numeric columns properly typed
     """
+    snapshot = _history_snapshot(_db_signature(), tuple(columns) if columns else None)
+    if snapshot.columns.empty:
+        # query_history() failed (a successful read always has columns); don't
+        # keep serving that empty result until the next write
+        _history_snapshot.cache_clear()
+    return snapshot.copy()
+
+
+def query_history(category: Optional[str] = None, price: Optional[str] = None,
+                  name_substr: Optional[str] = None, limit: Optional[int] = None,
+                  offset: Optional[int] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Retrieve app records matching the given filters, filtering inside SQLite.
+    
+    Args:
+        category: Exact category to match
+        price: Case-insensitive substring of the price (e.g. 'Free', 'Paid')
+        name_substr: Case-insensitive substring of the app name
+        limit: Maximum number of rows to return (newest first)
+        offset: Number of matching rows to skip (for paging)
+        columns: Columns to select (all columns if None)
+        
+    Returns:
+        DataFrame containing matching app records with numeric columns properly typed
+    """
+    clauses = []
+    params = []
+    if category:
+        clauses.append("categories = ?")
+        params.append(category)
+    if price:
+        clauses.append("price LIKE ? ESCAPE '\\'")
+        params.append(f"%{_escape_like(price)}%")
+    if name_substr:
+        clauses.append("app_name LIKE ? ESCAPE '\\'")
+        params.append(f"%{_escape_like(name_substr)}%")
+    
+    select_list = ", ".join(f'"{col}"' for col in columns) if columns else "*"
+    query = f"SELECT {select_list} FROM apps"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY scraped_at DESC, id DESC"
+    if limit or offset:
+        # SQLite needs a LIMIT before OFFSET; -1 means no limit
+        query += " LIMIT ?"
+        params.append(limit or -1)
+        if offset:
+            query += " OFFSET ?"
+            params.append(offset)
+    
     try:
-        conn = sqlite3.connect(DB_NAME)
-        df = pd.read_sql_query("SELECT * FROM apps ORDER BY scraped_at DESC", conn)
-        conn.close()
+        conn = _get_conn()
+        df = pd.read_sql_query(query, conn, params=params)
         
-        # Convert numeric columns to proper numeric types for sorting
+        # Convert numeric columns to proper numeric types for sorting. SQLite
+        # usually hands these back as int/float already; only columns that came
+        # back as objects (e.g. all NULL) need converting
         numeric_columns = ['rating_count_numeric', 'average_rating_numeric', 
                           'downloads_numeric', 'revenue_numeric']
         
         for col in numeric_columns:
-            if col in df.columns:
+            if col in df.columns and df[col].dtype.kind not in 'if':
                 # Convert to numeric, coercing errors to NaN
                 df[col] = pd.to_numeric(df[col], errors='coerce')
         
+        if 'scraped_at' in df.columns:
+            df['scraped_at'] = scraped_at_to_datetime(df['scraped_at'])
+        if 'in_app_purchases' in df.columns:
+            df['in_app_purchases'] = df['in_app_purchases'].map(decode_iap)
+        
         return df
     except Exception as e:
         print(f"Error retrieving history: {e}")
         return pd.DataFrame()
 
 
+def _read_apps_where(condition: str) -> pd.DataFrame:
+    """Read the full rows matching a fixed SQL condition (newest first)."""
+    try:
+        conn = _get_conn()
+        df = pd.read_sql_query(f"SELECT * FROM apps WHERE {condition} ORDER BY scraped_at DESC, id DESC", conn)
+        df['in_app_purchases'] = df['in_app_purchases'].map(decode_iap)
+        return df
+    except Exception as e:
+        print(f"Error retrieving apps: {e}")
+        return pd.DataFrame()
+
+
+def get_apps_missing_ratings() -> pd.DataFrame:
+    """
+    Retrieve the apps with no average rating or rating count, filtering inside SQLite.
+    
+    Returns:
+        DataFrame containing the matching app records
+    """
+    return _read_apps_where(
+        "average_rating IS NULL OR average_rating = '' OR rating_count IS NULL OR rating_count = ''"
+    )
+
+
+def get_apps_missing_release_dates() -> pd.DataFrame:
+    """
+    Retrieve the apps with no release date, filtering inside SQLite.
+    
+    Returns:
+        DataFrame containing the matching app records
+    """
+    return _read_apps_where("release_date IS NULL OR release_date = ''")
+
+
+def count_records() -> int:
+    """
+    Count the stored app records without loading them.
+    
+    Returns:
+        Number of rows in the apps table (0 on error)
+    """
+    try:
+        conn = _get_conn()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM apps")
+        count = cursor.fetchone()[0]
+        return count
+    except Exception as e:
+        print(f"Error counting records: {e}")
+        return 0
+
+
+def get_existing_app_ids() -> set:
+    """
+    Get the set of App Store IDs that already have a stored record.
+
+    Returns:
+        Set of app_id strings (empty on error)
+    """
+    try:
+        conn = _get_conn()
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT app_id FROM apps WHERE app_id IS NOT NULL AND app_id != ''")
+        app_ids = {str(row[0]) for row in cursor.fetchall()}
+        return app_ids
+    except Exception as e:
+        print(f"Error fetching existing app IDs: {e}")
+        return set()
+
+
+def get_summary_stats() -> Dict:
+    """
+    Compute the Database tab summary metrics with a single aggregate query.
+    
+    Returns:
+        Dictionary with total_apps, unique_categories, free_apps, paid_apps
+        and apps_with_ratings counts
+    """
+    stats = {
+        'total_apps': 0,
+        'unique_categories': 0,
+        'free_apps': 0,
+        'paid_apps': 0,
+        'apps_with_ratings': 0
+    }
+    try:
+        conn = _get_conn()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT
+                COUNT(*),
+                COUNT(DISTINCT categories),
+                COALESCE(SUM(price LIKE '%Free%'), 0),
+                COALESCE(SUM(price LIKE '%Paid%'), 0),
+                COUNT(average_rating)
+            FROM apps
+        """)
+        row = cursor.fetchone()
+        return dict(zip(stats.keys(), row))
+    except Exception as e:
+        print(f"Error computing summary stats: {e}")
+        return stats
+
+
+def get_categories() -> List[str]:
+    """
+    Retrieve the distinct app categories stored in the database.
+    
+    Returns:
+        Sorted list of category names
+    """
+    try:
+        conn = _get_conn()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT DISTINCT categories FROM apps WHERE categories IS NOT NULL ORDER BY categories"
+        )
+        categories = [row[0] for row in cursor.fetchall()]
+        return categories
+    except Exception as e:
+        print(f"Error retrieving categories: {e}")
+        return []
+
+
 def get_app_by_id(app_id: str) -> Optional[Dict]:
     """
     Retrieve a specific app by its ID.
@@ -312,16 +870,34 @@ def get_app_by_id(app_id: str) -> Optional[Dict]:
         Dictionary with app data or None if not found
     """
     try:
-        conn = sqlite3.connect(DB_NAME)
+        conn = _get_conn()
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         cursor.execute("SELECT * FROM apps WHERE app_id = ?", (app_id,))
         row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            columns = [description[0] for description in cursor.description]
-            return dict(zip(columns, row))
+        return _record_dict(row)
+    except Exception as e:
+        print(f"Error retrieving app: {e}")
         return None
+
+
+def get_app_by_record_id(record_id: int) -> Optional[Dict]:
+    """
+    Retrieve a specific app by its row ID (the 'id' primary key).
+    
+    Args:
+        record_id: The primary key of the apps row
+        
+    Returns:
+        Dictionary with app data or None if not found
+    """
+    try:
+        conn = _get_conn()
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute("SELECT * FROM apps WHERE id = ?", (record_id,))
+        row = cursor.fetchone()
+        return _record_dict(row)
     except Exception as e:
         print(f"Error retrieving app: {e}")
         return None
@@ -338,13 +914,10 @@ def delete_app(app_id: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM apps WHERE app_id = ?", (app_id,))
-        rows_deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
-        print(f"Deleted app with ID {app_id}. Rows affected: {rows_deleted}")
+        with _write_transaction() as cursor:
+            cursor.execute("DELETE FROM apps WHERE app_id = ?", (app_id,))
+            rows_deleted = cursor.rowcount
+        logger.debug("Deleted app with ID %s. Rows affected: %s", app_id, rows_deleted)
         return rows_deleted > 0
     except Exception as e:
         print(f"Error deleting app: {e}")
@@ -362,19 +935,20 @@ def delete_app_by_name(app_name: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM apps WHERE app_name = ?", (app_name,))
-        rows_deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
-        print(f"Deleted app '{app_name}'. Rows affected: {rows_deleted}")
+        with _write_transaction() as cursor:
+            cursor.execute("DELETE FROM apps WHERE app_name = ?", (app_name,))
+            rows_deleted = cursor.rowcount
+        logger.debug("Deleted app '%s'. Rows affected: %s", app_name, rows_deleted)
         return rows_deleted > 0
     except Exception as e:
         print(f"Error deleting app by name: {e}")
         return False
 
 
+# Maximum number of IDs bound into a single DELETE ... IN (...) statement
+DELETE_CHUNK_SIZE = 500
+
+
 def delete_apps_by_ids(app_ids: List[str]) -> int:
     """
     Delete multiple app records by their IDs.
@@ -389,14 +963,15 @@ def delete_apps_by_ids(app_ids: List[str]) -> int:
         return 0
     
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        placeholders = ','.join('?' * len(app_ids))
-        cursor.execute(f"DELETE FROM apps WHERE app_id IN ({placeholders})", app_ids)
-        rows_deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
-        print(f"Bulk deleted {rows_deleted} apps")
+        rows_deleted = 0
+        # One transaction for all chunks; each chunk stays under SQLite's bound-parameter limit
+        with _write_transaction() as cursor:
+            for start in range(0, len(app_ids), DELETE_CHUNK_SIZE):
+                chunk = app_ids[start:start + DELETE_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"DELETE FROM apps WHERE app_id IN ({placeholders})", chunk)
+                rows_deleted += cursor.rowcount
+        logger.debug("Bulk deleted %s apps", rows_deleted)
         return rows_deleted
     except Exception as e:
         print(f"Error bulk deleting apps: {e}")
@@ -3,21 +3,701 @@ Scraper module for extracting app data from SensorTower.
 Uses Playwright for browser automation.
 """
 
+import contextlib
 import json
+import os
 import re
+import sqlite3
 import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List
-from playwright.sync_api import sync_playwright, Page, Browser
-from bs4 import BeautifulSoup
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from playwright.sync_api import sync_playwright, Page, Browser, TimeoutError as PlaywrightTimeoutError
+from selectolax.lexbor import LexborHTMLParser
 
 
 SENSORTOWER_BASE_URL = "https://sensortower.com"
 SENSORTOWER_APP_BASE_URL = "https://app.sensortower.com"
 APPLE_STORE_SEARCH_URL = "https://apps.apple.com/us/iphone/search"
 APPLE_STORE_BASE_URL = "https://apps.apple.com"
+ITUNES_LOOKUP_URL = "https://itunes.apple.com/lookup"
 
+# The Lookup API accepts up to 200 comma-separated ids per request
+ITUNES_LOOKUP_BATCH_SIZE = 200
 
-def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000) -> Dict:
+
+def _create_http_session() -> requests.Session:
+    """
+    Create the HTTP session shared by the plain-HTTP lookups.
+    
+    Keeps connections alive across calls (and threads) and retries
+    transient failures and throttling responses with backoff.
+    """
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+HTTP_SESSION = _create_http_session()
+
+# Launch args used for headless Chromium (superset of the per-function args)
+HEADLESS_LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--allow-running-insecure-content',
+    '--disable-features=IsolateOrigins,site-per-process',
+]
+
+
+# On-disk cache of parsed App Store results; store metadata changes on a
+# release cadence of days, so a day-old result is still good
+APPLE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "sensortower", "apple_store.db")
+APPLE_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Optional DevTools endpoint of an already running Chromium to attach to instead
+# of launching one per scrape (e.g. http://localhost:9222)
+CDP_URL_ENV = "SENSORTOWER_CDP_URL"
+
+
+def _launch_browser(playwright, headless: bool, launch_args: Optional[List[str]] = None) -> Browser:
+    """
+    Launch Chromium, or attach to a shared one when SENSORTOWER_CDP_URL is set.
+    
+    Scrapes always open their own context on the returned browser. Closing a
+    browser attached over CDP only disconnects, so the shared one keeps running.
+    """
+    cdp_url = os.environ.get(CDP_URL_ENV)
+    if cdp_url:
+        return playwright.chromium.connect_over_cdp(cdp_url)
+    return playwright.chromium.launch(headless=headless, args=launch_args if launch_args else None)
+
+
+class BrowserSession:
+    """
+    A Playwright browser kept open across several scrape calls.
+    
+    Pass `session.browser` to the scrape functions to reuse it instead of
+    launching a new Chromium per call. Playwright's sync API is bound to the
+    thread that started it, so a session must be opened, used and closed on
+    the same thread (e.g. one session per batch worker).
+    
+    Usage:
+        with BrowserSession(headless=True) as session:
+            data = scrape_app_data("Facebook", browser=session.browser)
+    """
+    
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self.browser = None
+        self._playwright = None
+    
+    def __enter__(self) -> "BrowserSession":
+        self._playwright = sync_playwright().start()
+        try:
+            self.browser = _launch_browser(self._playwright, self.headless,
+                                           HEADLESS_LAUNCH_ARGS if self.headless else None)
+        except Exception:
+            # __exit__ won't run; stop Playwright so this thread can start it again
+            self.close()
+            raise
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the browser and stop Playwright."""
+        if self.browser:
+            try:
+                self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        if self._playwright:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+# Patterns for the text fallbacks in scrape_apple_app_store(), compiled once
+# instead of on every scrape
+APPLE_TEXT_PATTERNS = {
+    'rating_count_average': re.compile(r'(\d+\.?\d*[KMB]?)\s*Ratings?\s+(\d+\.?\d*)', re.I),
+    'out_of_5': re.compile(r'(\d+\.?\d*)\s+out of 5', re.I),
+    'rating_count': re.compile(r'(\d+\.?\d*[KMB]?)\s*Ratings?', re.I),
+    'age': re.compile(r'Ages\s+(\d+\+)', re.I),
+    'age_years': re.compile(r'(\d+\+)\s+Years?', re.I),
+    'category': re.compile(r'Category\s+([^\n\r]+)', re.I),
+    'developer': re.compile(r'Developer\s+([^\n\r]+)', re.I),
+    'language': re.compile(r'Language\s+([^\n\r]+?)(?:\n|Information|Supports|$)', re.I),
+    'size': re.compile(r'Size\s+([^\n\r]+)', re.I),
+    'free': re.compile(r'\bFree\b', re.I),
+    'price': re.compile(r'\$(\d+\.?\d*)'),
+    'compatibility': re.compile(r'Requires\s+([^\n\r]+)', re.I),
+    'copyright': re.compile(r'©\s+([^\n\r]+)'),
+    'released': re.compile(r'Released[:\s]+([A-Za-z]+\s+\d{1,2},?\s+\d{4})', re.I),
+    'version': re.compile(r'Version[:\s]+([\d.]+)', re.I),
+}
+
+# Fallback release date formats, tried in order
+APPLE_RELEASE_PATTERNS = [
+    re.compile(r'(?:First\s+)?Released[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})', re.I),
+    re.compile(r'(?:First\s+)?Released[:\s]+([A-Za-z]+\s+\d{1,2},?\s+\d{4})', re.I),
+    re.compile(r'Release\s+Date[:\s]+([A-Za-z]+\s+\d{1,2},?\s+\d{4})', re.I),
+    re.compile(r'First\s+Available[:\s]+([A-Za-z]+\s+\d{1,2},?\s+\d{4})', re.I),
+]
+
+
+# Everything scrape_apple_app_store() reads from the rendered page, gathered in a
+# single page.evaluate() round trip
+APPLE_EXTRACT_JS = """
+() => {
+    const bodyText = document.body.innerText;
+    
+    const extractRatings = () => {
+        const result = { rating_count: null, average_rating: null };
+        
+        // More comprehensive patterns
+        // Pattern 1: "8.1K Ratings 4.6" or "8.1K Ratings\\n4.6"
+        const pattern1 = /(\\d+\\.?\\d*[KMB]?)\\s*Ratings?[\\s\\n]+(\\d+\\.?\\d*)/i;
+        const match1 = bodyText.match(pattern1);
+        if (match1) {
+            result.rating_count = match1[1];
+            result.average_rating = match1[2];
+        }
+        
+        // Pattern 2: "4.6 out of 5  8.1K Ratings"
+        if (!result.rating_count || !result.average_rating) {
+            const pattern2 = /(\\d+\\.?\\d*)\\s+out of 5[\\s\\n]+(\\d+\\.?\\d*[KMB]?)\\s*Ratings?/i;
+            const match2 = bodyText.match(pattern2);
+            if (match2) {
+                result.average_rating = match2[1];
+                result.rating_count = match2[2];
+            }
+        }
+        
+        // Pattern 3: Look for rating and count separately
+        if (!result.average_rating) {
+            const ratingMatch = bodyText.match(/(\\d+\\.?\\d*)\\s+out of 5/i);
+            if (ratingMatch) {
+                result.average_rating = ratingMatch[1];
+            }
+        }
+        
+        if (!result.rating_count) {
+            // Look for rating count with decimal (e.g., "8.1K")
+            const countMatch = bodyText.match(/(\\d+\\.?\\d*[KMB]?)\\s*Ratings?/i);
+            if (countMatch) {
+                result.rating_count = countMatch[1];
+            }
+        }
+        
+        // Try finding rating elements directly in the DOM
+        const allElements = document.querySelectorAll('*');
+        for (const elem of allElements) {
+            const text = elem.textContent || elem.innerText || '';
+            if (text.includes('Ratings') || text.includes('out of 5')) {
+                // Check for rating count with decimal
+                const countMatch = text.match(/(\\d+\\.?\\d*[KMB]?)\\s*Ratings?/i);
+                if (countMatch && !result.rating_count) {
+                    result.rating_count = countMatch[1];
+                }
+                
+                // Check for average rating
+                const ratingMatch = text.match(/(\\d+\\.?\\d*)\\s+out of 5/i);
+                if (ratingMatch && !result.average_rating) {
+                    result.average_rating = ratingMatch[1];
+                }
+                
+                // Also try pattern: "4.6" near "Ratings"
+                if (!result.average_rating && text.includes('Ratings')) {
+                    const nearRating = text.match(/(\\d+\\.?\\d*)\\s*[\\s\\n]*Ratings?/i);
+                    if (nearRating) {
+                        // Check if there's a number before "Ratings"
+                        const beforeRatings = text.substring(0, text.indexOf('Ratings'));
+                        const numMatch = beforeRatings.match(/(\\d+\\.?\\d*)\\s*$/);
+                        if (numMatch) {
+                            result.average_rating = numMatch[1];
+                        }
+                    }
+                }
+                
+                if (result.average_rating && result.rating_count) {
+                    break;
+                }
+            }
+        }
+        
+        return result;
+    };
+    
+    const extractLanguages = () => {
+        // Look for "Language" followed by text
+        const langMatch = bodyText.match(/Language[\\s:]+([^\\n\\r]+?)(?:\\n|Information|Supports|$)/i);
+        if (langMatch) {
+            return langMatch[1].trim();
+        }
+        return null;
+    };
+    
+    const extractInAppPurchases = () => {
+        const iapItems = [];
+        
+        // Look for "In-App Purchases" section
+        const iapIndex = bodyText.toLowerCase().indexOf('in-app purchases');
+        if (iapIndex === -1) {
+            // Try alternative text
+            const altIndex = bodyText.toLowerCase().indexOf('in‑app purchases');
+            if (altIndex === -1) return [];
+            var sectionStart = altIndex;
+        } else {
+            var sectionStart = iapIndex;
+        }
+        
+        // Extract larger section to get all IAPs
+        const section = bodyText.substring(sectionStart, sectionStart + 5000);
+        
+        // Look for IAP items - they usually appear as lines with prices
+        const lines = section.split('\\n');
+        let inIapSection = false;
+        
+        for (let i = 0; i < lines.length; i++) {
+            const line = lines[i].trim();
+            
+            // Check if we're in the IAP section
+            if (line.toLowerCase().includes('in-app purchase') || 
+                line.toLowerCase().includes('in‑app purchase')) {
+                inIapSection = true;
+                continue;
+            }
+            
+            // Stop if we hit another major section
+            if (inIapSection && (line.toLowerCase().includes('information') || 
+                line.toLowerCase().includes('supports') ||
+                line.toLowerCase().includes('privacy'))) {
+                break;
+            }
+            
+            if (inIapSection && line) {
+                // Look for price pattern
+                const priceMatch = line.match(/\\$([\\d,]+(?:\\.\\d{2})?)/);
+                if (priceMatch) {
+                    const price = '$' + priceMatch[1];
+                    // Get product name (everything before the price)
+                    const name = line.replace(/\\$[\\d,]+(?:\\.\\d{2})?.*$/, '').trim();
+                    
+                    if (name && name.length > 0 && name.length < 200) {
+                        iapItems.push({
+                            name: name,
+                            price: price
+                        });
+                    } else {
+                        iapItems.push({
+                            name: 'In-App Purchase',
+                            price: price
+                        });
+                    }
+                }
+            }
+        }
+        
+        // Also try to find IAP in HTML structure
+        if (iapItems.length === 0) {
+            // Look for list items or divs containing prices
+            const priceElements = document.querySelectorAll('*');
+            for (const elem of priceElements) {
+                const text = elem.textContent || '';
+                const priceMatch = text.match(/\\$([\\d,]+(?:\\.\\d{2})?)/);
+                if (priceMatch && text.toLowerCase().includes('subscription') || 
+                    text.toLowerCase().includes('purchase')) {
+                    const price = '$' + priceMatch[1];
+                    const name = text.replace(/\\$[\\d,]+(?:\\.\\d{2})?.*$/, '').trim();
+                    if (name && name.length < 200) {
+                        iapItems.push({ name: name, price: price });
+                    }
+                }
+            }
+        }
+        
+        // Remove duplicates
+        const uniqueIaps = [];
+        const seen = new Set();
+        for (const iap of iapItems) {
+            const key = iap.name + '|' + iap.price;
+            if (!seen.has(key)) {
+                seen.add(key);
+                uniqueIaps.push(iap);
+            }
+        }
+        
+        return uniqueIaps.slice(0, 20); // Limit to 20 items
+    };
+    
+    const extractReleaseDate = () => {
+        // Look for "Released" followed by date in various formats
+        const patterns = [
+            /Released[\\s:]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})/i,
+            /Release\\s+Date[\\s:]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})/i,
+            /First\\s+Available[\\s:]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})/i,
+            /Released[\\s:]+(\\d{1,2}[/-]\\d{1,2}[/-]\\d{4})/i,
+        ];
+        
+        for (const pattern of patterns) {
+            const match = bodyText.match(pattern);
+            if (match && match[1]) {
+                return match[1].trim();
+            }
+        }
+        
+        // Also check HTML for structured data
+        const metaTags = document.querySelectorAll('meta');
+        for (const tag of metaTags) {
+            const property = tag.getAttribute('property') || tag.getAttribute('name') || '';
+            const content = tag.getAttribute('content') || '';
+            if ((property.includes('release') || property.includes('date')) && content) {
+                const dateMatch = content.match(/(\\d{4}[\\/-]\\d{1,2}[\\/-]\\d{1,2}|[A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})/);
+                if (dateMatch) {
+                    return dateMatch[1].trim();
+                }
+            }
+        }
+        
+        return null;
+    };
+    
+    const extractVersion = () => {
+        const match = bodyText.match(/Version[\\s:]+([\\d.]+)/i);
+        return match ? match[1].trim() : null;
+    };
+    
+    // Text of an element with each text node stripped and joined, skipping scripts and styles
+    const textOf = (elem) => {
+        const pieces = [];
+        const walker = document.createTreeWalker(elem, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const parent = walker.currentNode.parentElement;
+            if (parent && ['SCRIPT', 'STYLE', 'TEMPLATE'].includes(parent.tagName)) continue;
+            const text = walker.currentNode.nodeValue.trim();
+            if (text) pieces.push(text);
+        }
+        return pieces.join('');
+    };
+    
+    const heading = document.querySelector('h1');
+    
+    const extractDescriptionCandidates = () => [
+        'div[class*="description"]',
+        'div[class*="product-review"]',
+        'div[class*="app-description"]',
+        'section[class*="description"]',
+        'p[class*="description"]'
+    ].map((selector) => {
+        const elem = document.querySelector(selector);
+        return elem ? textOf(elem) : null;
+    });
+    
+    // First <p> after the h1 in document order
+    const extractHeadingParagraph = () => {
+        if (!heading) return null;
+        for (const p of document.querySelectorAll('p')) {
+            if (heading.compareDocumentPosition(p) & Node.DOCUMENT_POSITION_FOLLOWING) {
+                return textOf(p);
+            }
+        }
+        return null;
+    };
+    
+    const firstHref = (pattern) => {
+        for (const link of document.querySelectorAll('a[href]')) {
+            const href = link.getAttribute('href');
+            if (pattern.test(href)) return href;
+        }
+        return null;
+    };
+    
+    // One failing field must not lose the others
+    const safe = (extract, fallback) => {
+        try {
+            return extract();
+        } catch (e) {
+            return fallback;
+        }
+    };
+    
+    return {
+        title: document.title,
+        bodyText: bodyText,
+        heading: heading ? textOf(heading) : null,
+        ratings: safe(extractRatings, {}),
+        languages: safe(extractLanguages, null),
+        inAppPurchases: safe(extractInAppPurchases, []),
+        descriptionCandidates: safe(extractDescriptionCandidates, []),
+        headingParagraph: safe(extractHeadingParagraph, null),
+        releaseDate: safe(extractReleaseDate, null),
+        version: safe(extractVersion, null),
+        supportHref: safe(() => firstHref(/support|help/), null),
+        developerHref: safe(() => firstHref(/developer|publisher/), null)
+    };
+}
+"""
+
+
+# Resource types the App Store pages don't need for text extraction
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media'})
+
+
+def _block_heavy_resources(context):
+    """Abort image, font and media requests in a browser context so pages load only what is parsed."""
+    context.route(
+        "**/*",
+        lambda route: route.abort() if route.request.resource_type in BLOCKED_RESOURCE_TYPES else route.continue_()
+    )
+
+
+def _close_browser(browser: Optional[Browser], context, owns_browser: bool):
+    """Close the browser if this call launched it, otherwise only its own context."""
+    if owns_browser:
+        if browser:
+            browser.close()
+    elif context:
+        context.close()
+
+
+def _format_count(count) -> str:
+    """Format a count the way the App Store page shows it (e.g. 8100 -> '8.1K')."""
+    if count is None:
+        return ''
+    if count < 1000:
+        return str(count)
+    # Move to the next unit when rounding reaches 1000 (999950 -> '1M', not '1000K')
+    for divisor, unit in ((1000, 'K'), (1000000, 'M'), (1000000000, 'B')):
+        text = f"{count / divisor:.1f}"
+        if float(text) < 1000 or unit == 'B':
+            return text.rstrip('0').rstrip('.') + unit
+
+
+def _format_release_date(value: str) -> str:
+    """Format an ISO release date (e.g. '2020-10-07T07:00:00Z') like the App Store page ('Oct 7, 2020')."""
+    if not value:
+        return ''
+    try:
+        date = datetime.strptime(value[:10], "%Y-%m-%d")
+    except ValueError:
+        return value
+    return f"{date:%b} {date.day}, {date.year}"
+
+
+def _format_size(num_bytes) -> str:
+    """Format a byte count the way the App Store page shows it (e.g. 52428800 -> '50 MB')."""
+    try:
+        size = float(num_bytes)
+    except (TypeError, ValueError):
+        return ''
+    for divisor, unit in ((1024 ** 3, 'GB'), (1024 ** 2, 'MB'), (1024, 'KB')):
+        if size >= divisor:
+            return f"{size / divisor:.1f}".rstrip('0').rstrip('.') + f" {unit}"
+    return f"{int(size)} bytes"
+
+
+def _parse_lookup_result(app: Dict) -> Dict:
+    """Map one iTunes Lookup API result onto the scrape_apple_app_store() result fields."""
+    result = {
+        'app_name': app.get('trackName', ''),
+        'app_id': str(app.get('trackId', '')),
+        'rating_count': '',
+        'average_rating': '',
+        'age_rating': app.get('contentAdvisoryRating', ''),
+        'category': app.get('primaryGenreName', ''),
+        'developer_name': app.get('artistName', '') or app.get('sellerName', ''),
+        'languages': ', '.join(app.get('languageCodesISO2A') or []),
+        'app_size': _format_size(app.get('fileSizeBytes')),
+        'price': app.get('formattedPrice', '') or ('Free' if not app.get('price') else f"${app['price']}"),
+        'in_app_purchases': [],
+        'description': '',
+        'release_date': _format_release_date(app.get('releaseDate', '')),
+        'version': app.get('version', ''),
+        'compatibility': f"iOS {app['minimumOsVersion']} or later" if app.get('minimumOsVersion') else '',
+        'copyright': '',
+        'support_url': '',
+        'developer_website': app.get('sellerUrl', '')
+    }
+    # Apps without ratings report 0 for both; leave them empty like the page scrape
+    if app.get('userRatingCount'):
+        result['rating_count'] = _format_count(app['userRatingCount'])
+        if app.get('averageUserRating') is not None:
+            result['average_rating'] = f"{app['averageUserRating']:.1f}"
+    description = ' '.join((app.get('description') or '').split())
+    if description:
+        result['description'] = description[:500] + ('...' if len(description) > 500 else '')
+    return result
+
+
+def lookup_apple_metadata(app_id: str, country: str = "us", timeout: int = 10) -> Dict:
+    """
+    Fetch an app's store data from Apple's iTunes Lookup API.
+    
+    This is a single JSON request, so it is much cheaper than loading the
+    App Store page in a browser with scrape_apple_app_store().
+    
+    Args:
+        app_id: Apple App Store ID (numeric)
+        country: Store country code
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Dictionary with the same fields as scrape_apple_app_store(), or with
+        an 'error' key if the lookup failed. In-app purchases, copyright and
+        support URL are not in the API and stay empty, and languages are ISO
+        codes (e.g. "EN, FR") rather than the page's display names
+    """
+    result = {
+        'app_name': '',
+        'app_id': str(app_id),
+        'average_rating': '',
+        'rating_count': '',
+        'release_date': ''
+    }
+    
+    try:
+        response = HTTP_SESSION.get(ITUNES_LOOKUP_URL, params={'id': app_id, 'country': country}, timeout=timeout)
+        response.raise_for_status()
+        results = response.json().get('results', [])
+    except (requests.RequestException, ValueError) as e:
+        result['error'] = f"iTunes lookup failed: {str(e)}"
+        return result
+    
+    if not results:
+        result['error'] = f"App ID {app_id} not found in iTunes lookup"
+        return result
+    
+    result.update(_parse_lookup_result(results[0]))
+    result['app_id'] = str(app_id)
+    return result
+
+
+def _open_apple_cache() -> sqlite3.Connection:
+    """Open the App Store result cache, creating it on first use."""
+    os.makedirs(os.path.dirname(APPLE_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(APPLE_CACHE_PATH, timeout=10)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS apple_store_results (
+            app_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            result TEXT NOT NULL,
+            cached_at REAL NOT NULL,
+            PRIMARY KEY (app_id, source)
+        )
+    ''')
+    return conn
+
+
+def _get_cached_apple_result(app_id: str, sources: List[str]) -> Optional[Dict]:
+    """
+    Return the cached App Store result for an App ID if it is younger than APPLE_CACHE_TTL.
+    
+    Only results from the given sources ('page' for a rendered page scrape,
+    'lookup' for the partial iTunes Lookup API result) are considered, in
+    that order of preference.
+    """
+    try:
+        with contextlib.closing(_open_apple_cache()) as conn:
+            rows = dict(conn.execute(
+                f"SELECT source, result FROM apple_store_results "
+                f"WHERE app_id = ? AND cached_at > ? AND source IN ({','.join('?' * len(sources))})",
+                (app_id, time.time() - APPLE_CACHE_TTL, *sources)
+            ).fetchall())
+        for source in sources:
+            if source in rows:
+                return json.loads(rows[source])
+        return None
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"Warning: could not read App Store cache: {e}")
+        return None
+
+
+def _cache_apple_result(app_id: str, source: str, result: Dict):
+    """Store a successful App Store result for an App ID under its source ('page' or 'lookup')."""
+    if result.get('error') or not (result.get('average_rating') or result.get('rating_count')):
+        return
+    try:
+        with contextlib.closing(_open_apple_cache()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO apple_store_results (app_id, source, result, cached_at) VALUES (?, ?, ?, ?)",
+                (app_id, source, json.dumps(result), time.time())
+            )
+    except (sqlite3.Error, OSError) as e:
+        print(f"Warning: could not write App Store cache: {e}")
+
+
+def _lookup_chunk(app_ids: List[str], country: str, timeout: int) -> Dict[str, Dict]:
+    """Look up one chunk of App IDs in a single iTunes Lookup request."""
+    try:
+        response = HTTP_SESSION.get(ITUNES_LOOKUP_URL, params={'id': ','.join(app_ids), 'country': country},
+                                    timeout=timeout)
+        response.raise_for_status()
+        results = response.json().get('results', [])
+    except (requests.RequestException, ValueError) as e:
+        return {app_id: {'app_id': app_id, 'error': f"iTunes lookup failed: {str(e)}"} for app_id in app_ids}
+    
+    found = {}
+    for app in results:
+        parsed = _parse_lookup_result(app)
+        found[parsed['app_id']] = parsed
+    return {
+        app_id: found.get(app_id) or {'app_id': app_id, 'error': f"App ID {app_id} not found in iTunes lookup"}
+        for app_id in app_ids
+    }
+
+
+def lookup_apple_metadata_batch(app_ids: List[str], country: str = "us", timeout: int = 10,
+                                max_workers: int = 4) -> Dict[str, Dict]:
+    """
+    Look up many apps with the iTunes Lookup API, up to 200 per request.
+    
+    Chunks are requested concurrently on the shared HTTP session.
+    
+    Args:
+        app_ids: Apple App Store IDs
+        country: Store country code
+        timeout: Request timeout in seconds
+        max_workers: Number of chunks requested at once
+        
+    Returns:
+        Dictionary mapping each App ID (as a string) to the same result as
+        lookup_apple_metadata(), with an 'error' key for IDs that failed
+    """
+    results = {}
+    numeric_ids = []
+    for app_id in dict.fromkeys(str(app_id).strip() for app_id in app_ids):
+        if app_id.isdigit():
+            numeric_ids.append(app_id)
+        else:
+            results[app_id] = {'app_id': app_id, 'error': f"Invalid Apple App Store ID: {app_id}"}
+    
+    chunks = [numeric_ids[start:start + ITUNES_LOOKUP_BATCH_SIZE]
+              for start in range(0, len(numeric_ids), ITUNES_LOOKUP_BATCH_SIZE)]
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+            for chunk_results in executor.map(lambda chunk: _lookup_chunk(chunk, country, timeout), chunks):
+                results.update(chunk_results)
+    return results
+
+
+def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000,
+                           browser: Optional[Browser] = None, use_lookup: bool = False,
+                           force_refresh: bool = False) -> Dict:
     """
     Scrape app data directly from Apple App Store page.
     
@@ -39,10 +719,31 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
         url: Apple App Store URL (e.g., https://apps.apple.com/us/app/vocal-image-ai-speaking-coach/id1535324205)
         headless: Whether to run browser in headless mode
         timeout: Page load timeout in milliseconds
+        browser: Optional already-launched browser to reuse (see BrowserSession)
+        use_lookup: Try the iTunes Lookup API first and only render the page
+            when it returns no ratings. A lookup result has no in-app
+            purchases, copyright or support URL, and gives languages as
+            ISO codes (e.g. "EN, FR") instead of display names
+        force_refresh: Ignore results cached within APPLE_CACHE_TTL
         
     Returns:
         Dictionary containing extracted app data
     """
+    id_match = re.search(r'/id(\d+)', url)
+    cache_key = id_match.group(1) if id_match else None
+    if cache_key and not force_refresh:
+        # A full page result always satisfies the call; the partial lookup
+        # result only does when the caller opted into it
+        cached = _get_cached_apple_result(cache_key, ['page', 'lookup'] if use_lookup else ['page'])
+        if cached:
+            return cached
+    
+    if use_lookup and cache_key:
+        lookup = lookup_apple_metadata(cache_key)
+        if not lookup.get('error') and (lookup.get('average_rating') or lookup.get('rating_count')):
+            _cache_apple_result(cache_key, 'lookup', lookup)
+            return lookup
+    
     result = {
         'app_name': '',
         'app_id': '',
@@ -64,23 +765,22 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
         'developer_website': ''
     }
     
-    browser = None
+    owns_browser = browser is None
+    context = None
     try:
-        with sync_playwright() as p:
-            # Configure browser launch args
-            launch_args = []
-            if headless:
-                launch_args.extend([
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                ])
-            
-            browser = p.chromium.launch(
-                headless=headless,
-                args=launch_args if launch_args else None
-            )
+        with (sync_playwright() if owns_browser else contextlib.nullcontext()) as p:
+            if owns_browser:
+                # Configure browser launch args
+                launch_args = []
+                if headless:
+                    launch_args.extend([
+                        '--disable-blink-features=AutomationControlled',
+                        '--disable-dev-shm-usage',
+                        '--no-sandbox',
+                        '--disable-setuid-sandbox',
+                    ])
+            
+                browser = _launch_browser(p, headless, launch_args)
             
             context = browser.new_context(
                 user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -93,23 +793,24 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
                     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                 }
             )
+            _block_heavy_resources(context)
             page = context.new_page()
             page.set_default_timeout(timeout)
             
             # Navigate to Apple App Store page
             page.goto(url, wait_until="domcontentloaded", timeout=timeout)
-            time.sleep(3)  # Wait for page to fully load
             
-            # Wait for main content to load
+            # Wait for the product header instead of sleeping a fixed time;
+            # on timeout extraction still runs and the fallbacks fill the gaps
             try:
-                page.wait_for_selector('body', state='visible', timeout=10000)
-                time.sleep(2)  # Additional wait for dynamic content
-            except:
+                page.wait_for_selector("h1, [class*='product-header']", timeout=8000)
+                page.wait_for_load_state("networkidle", timeout=5000)
+            except PlaywrightTimeoutError:
                 pass
             
-            # Get page HTML
-            html_content = page.content()
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Read everything needed from the live DOM in one round trip
+            page_data = page.evaluate(APPLE_EXTRACT_JS)
+            page_text = page_data.get('bodyText') or ''
             
             # Extract App ID from URL
             id_match = re.search(r'/id(\d+)', url)
@@ -117,124 +818,29 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
                 result['app_id'] = id_match.group(1)
             
             # Extract app name from page title or h1
-            try:
-                page_title = page.title()
-                if page_title:
-                    # Format: "App Name - Apple App Store - US - ..."
-                    title_parts = page_title.split(' - ')
-                    if title_parts:
-                        result['app_name'] = title_parts[0].strip()
-            except:
-                pass
+            page_title = page_data.get('title')
+            if page_title:
+                # Format: "App Name - Apple App Store - US - ..."
+                title_parts = page_title.split(' - ')
+                if title_parts:
+                    result['app_name'] = title_parts[0].strip()
             
             # Try to get app name from h1
-            if not result['app_name']:
-                try:
-                    h1 = soup.find('h1')
-                    if h1:
-                        result['app_name'] = h1.get_text(strip=True)
-                except:
-                    pass
+            if not result['app_name'] and page_data.get('heading'):
+                result['app_name'] = page_data['heading']
             
-            # Extract rating information using JavaScript
-            try:
-                rating_data = page.evaluate("""
-                    () => {
-                        const result = { rating_count: null, average_rating: null };
-                        
-                        // Look for rating text patterns in the entire page
-                        const bodyText = document.body.innerText;
-                        
-                        // More comprehensive patterns
-                        // Pattern 1: "8.1K Ratings 4.6" or "8.1K Ratings\\n4.6"
-                        const pattern1 = /(\\d+\\.?\\d*[KMB]?)\\s*Ratings?[\\s\\n]+(\\d+\\.?\\d*)/i;
-                        const match1 = bodyText.match(pattern1);
-                        if (match1) {
-                            result.rating_count = match1[1];
-                            result.average_rating = match1[2];
-                        }
-                        
-                        // Pattern 2: "4.6 out of 5  8.1K Ratings"
-                        if (!result.rating_count || !result.average_rating) {
-                            const pattern2 = /(\\d+\\.?\\d*)\\s+out of 5[\\s\\n]+(\\d+\\.?\\d*[KMB]?)\\s*Ratings?/i;
-                            const match2 = bodyText.match(pattern2);
-                            if (match2) {
-                                result.average_rating = match2[1];
-                                result.rating_count = match2[2];
-                            }
-                        }
-                        
-                        // Pattern 3: Look for rating and count separately
-                        if (!result.average_rating) {
-                            const ratingMatch = bodyText.match(/(\\d+\\.?\\d*)\\s+out of 5/i);
-                            if (ratingMatch) {
-                                result.average_rating = ratingMatch[1];
-                            }
-                        }
-                        
-                        if (!result.rating_count) {
-                            // Look for rating count with decimal (e.g., "8.1K")
-                            const countMatch = bodyText.match(/(\\d+\\.?\\d*[KMB]?)\\s*Ratings?/i);
-                            if (countMatch) {
-                                result.rating_count = countMatch[1];
-                            }
-                        }
-                        
-                        // Try finding rating elements directly in the DOM
-                        const allElements = document.querySelectorAll('*');
-                        for (const elem of allElements) {
-                            const text = elem.textContent || elem.innerText || '';
-                            if (text.includes('Ratings') || text.includes('out of 5')) {
-                                // Check for rating count with decimal
-                                const countMatch = text.match(/(\\d+\\.?\\d*[KMB]?)\\s*Ratings?/i);
-                                if (countMatch && !result.rating_count) {
-                                    result.rating_count = countMatch[1];
-                                }
-                                
-                                // Check for average rating
-                                const ratingMatch = text.match(/(\\d+\\.?\\d*)\\s+out of 5/i);
-                                if (ratingMatch && !result.average_rating) {
-                                    result.average_rating = ratingMatch[1];
-                                }
-                                
-                                // Also try pattern: "4.6" near "Ratings"
-                                if (!result.average_rating && text.includes('Ratings')) {
-                                    const nearRating = text.match(/(\\d+\\.?\\d*)\\s*[\\s\\n]*Ratings?/i);
-                                    if (nearRating) {
-                                        // Check if there's a number before "Ratings"
-                                        const beforeRatings = text.substring(0, text.indexOf('Ratings'));
-                                        const numMatch = beforeRatings.match(/(\\d+\\.?\\d*)\\s*$/);
-                                        if (numMatch) {
-                                            result.average_rating = numMatch[1];
-                                        }
-                                    }
-                                }
-                                
-                                if (result.average_rating && result.rating_count) {
-                                    break;
-                                }
-                            }
-                        }
-                        
-                        return result;
-                    }
-                """)
-                
-                if rating_data.get('rating_count'):
-                    result['rating_count'] = str(rating_data['rating_count']).strip()
-                if rating_data.get('average_rating'):
-                    result['average_rating'] = str(rating_data['average_rating']).strip()
-            except Exception as e:
-                print(f"Warning: Error extracting ratings via JavaScript: {str(e)}")
-                pass
+            # Rating information found by the page script
+            rating_data = page_data.get('ratings') or {}
+            if rating_data.get('rating_count'):
+                result['rating_count'] = str(rating_data['rating_count']).strip()
+            if rating_data.get('average_rating'):
+                result['average_rating'] = str(rating_data['average_rating']).strip()
             
             # Fallback: Extract from page text using regex
-            page_text = page.inner_text('body')
-            
             # Only use fallback if we didn't get both values from JavaScript
             if not result['rating_count'] or not result['average_rating']:
                 # Pattern: "8.1K Ratings 4.6" or "4.6 out of 5  8.1K Ratings"
-                rating_match = re.search(r'(\d+\.?\d*[KMB]?)\s*Ratings?\s+(\d+\.?\d*)', page_text, re.I)
+                rating_match = APPLE_TEXT_PATTERNS['rating_count_average'].search(page_text)
                 if rating_match:
                     if not result['rating_count']:
                         result['rating_count'] = rating_match.group(1).strip()
@@ -243,12 +849,12 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
                 else:
                     # Try alternative pattern: "4.6 out of 5"
                     if not result['average_rating']:
-                        rating_alt = re.search(r'(\d+\.?\d*)\s+out of 5', page_text, re.I)
+                        rating_alt = APPLE_TEXT_PATTERNS['out_of_5'].search(page_text)
                         if rating_alt:
                             result['average_rating'] = rating_alt.group(1).strip()
                     # Try to find rating count separately
                     if not result['rating_count']:
-                        count_match = re.search(r'(\d+\.?\d*[KMB]?)\s*Ratings?', page_text, re.I)
+                        count_match = APPLE_TEXT_PATTERNS['rating_count'].search(page_text)
                         if count_match:
                             result['rating_count'] = count_match.group(1).strip()
             
@@ -259,47 +865,33 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
                 print(f"Warning: No ratings found on Apple App Store page")
             
             # Extract age rating (e.g., "Ages 4+")
-            age_match = re.search(r'Ages\s+(\d+\+)', page_text, re.I)
+            age_match = APPLE_TEXT_PATTERNS['age'].search(page_text)
             if age_match:
                 result['age_rating'] = age_match.group(1)
             else:
                 # Try alternative pattern
-                age_alt = re.search(r'(\d+\+)\s+Years?', page_text, re.I)
+                age_alt = APPLE_TEXT_PATTERNS['age_years'].search(page_text)
                 if age_alt:
                     result['age_rating'] = age_alt.group(1)
             
             # Extract category
-            category_match = re.search(r'Category\s+([^\n\r]+)', page_text, re.I)
+            category_match = APPLE_TEXT_PATTERNS['category'].search(page_text)
             if category_match:
                 result['category'] = category_match.group(1).strip()
             
             # Extract developer name
-            dev_match = re.search(r'Developer\s+([^\n\r]+)', page_text, re.I)
+            dev_match = APPLE_TEXT_PATTERNS['developer'].search(page_text)
             if dev_match:
                 result['developer_name'] = dev_match.group(1).strip()
             
             # Extract language (capture full text including "+ 5 More")
             # Try JavaScript first for better accuracy
-            try:
-                lang_data = page.evaluate("""
-                    () => {
-                        const bodyText = document.body.innerText;
-                        // Look for "Language" followed by text
-                        const langMatch = bodyText.match(/Language[\\s:]+([^\\n\\r]+?)(?:\\n|Information|Supports|$)/i);
-                        if (langMatch) {
-                            return langMatch[1].trim();
-                        }
-                        return null;
-                    }
-                """)
-                if lang_data:
-                    result['languages'] = lang_data
-            except:
-                pass
+            if page_data.get('languages'):
+                result['languages'] = page_data['languages']
             
             # Fallback to regex
             if not result['languages']:
-                lang_match = re.search(r'Language\s+([^\n\r]+?)(?:\n|Information|Supports|$)', page_text, re.I)
+                lang_match = APPLE_TEXT_PATTERNS['language'].search(page_text)
                 if lang_match:
                     lang_text = lang_match.group(1).strip()
                     # Clean up common patterns
@@ -307,124 +899,24 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
                     result['languages'] = lang_text
             
             # Extract app size
-            size_match = re.search(r'Size\s+([^\n\r]+)', page_text, re.I)
+            size_match = APPLE_TEXT_PATTERNS['size'].search(page_text)
             if size_match:
                 result['app_size'] = size_match.group(1).strip()
             
             # Extract price (Free or Paid)
-            if re.search(r'\bFree\b', page_text, re.I):
+            if APPLE_TEXT_PATTERNS['free'].search(page_text):
                 result['price'] = 'Free'
             else:
                 # Look for price in text
-                price_match = re.search(r'\$(\d+\.?\d*)', page_text)
+                price_match = APPLE_TEXT_PATTERNS['price'].search(page_text)
                 if price_match:
                     result['price'] = f"${price_match.group(1)}"
                 else:
                     result['price'] = 'Free'  # Default if no price found
             
             # Extract in-app purchases
-            try:
-                iap_section = page.evaluate("""
-                    () => {
-                        const iapItems = [];
-                        const bodyText = document.body.innerText;
-                        const htmlContent = document.body.innerHTML;
-                        
-                        // Look for "In-App Purchases" section
-                        const iapIndex = bodyText.toLowerCase().indexOf('in-app purchases');
-                        if (iapIndex === -1) {
-                            // Try alternative text
-                            const altIndex = bodyText.toLowerCase().indexOf('in‑app purchases');
-                            if (altIndex === -1) return [];
-                            var sectionStart = altIndex;
-                        } else {
-                            var sectionStart = iapIndex;
-                        }
-                        
-                        // Extract larger section to get all IAPs
-                        const section = bodyText.substring(sectionStart, sectionStart + 5000);
-                        
-                        // Look for IAP items - they usually appear as lines with prices
-                        const lines = section.split('\\n');
-                        let inIapSection = false;
-                        
-                        for (let i = 0; i < lines.length; i++) {
-                            const line = lines[i].trim();
-                            
-                            // Check if we're in the IAP section
-                            if (line.toLowerCase().includes('in-app purchase') || 
-                                line.toLowerCase().includes('in‑app purchase')) {
-                                inIapSection = true;
-                                continue;
-                            }
-                            
-                            // Stop if we hit another major section
-                            if (inIapSection && (line.toLowerCase().includes('information') || 
-                                line.toLowerCase().includes('supports') ||
-                                line.toLowerCase().includes('privacy'))) {
-                                break;
-                            }
-                            
-                            if (inIapSection && line) {
-                                // Look for price pattern
-                                const priceMatch = line.match(/\\$([\\d,]+(?:\\.\\d{2})?)/);
-                                if (priceMatch) {
-                                    const price = '$' + priceMatch[1];
-                                    // Get product name (everything before the price)
-                                    const name = line.replace(/\\$[\\d,]+(?:\\.\\d{2})?.*$/, '').trim();
-                                    
-                                    if (name && name.length > 0 && name.length < 200) {
-                                        iapItems.push({
-                                            name: name,
-                                            price: price
-                                        });
-                                    } else {
-                                        iapItems.push({
-                                            name: 'In-App Purchase',
-                                            price: price
-                                        });
-                                    }
-                                }
-                            }
-                        }
-                        
-                        // Also try to find IAP in HTML structure
-                        if (iapItems.length === 0) {
-                            // Look for list items or divs containing prices
-                            const priceElements = document.querySelectorAll('*');
-                            for (const elem of priceElements) {
-                                const text = elem.textContent || '';
-                                const priceMatch = text.match(/\\$([\\d,]+(?:\\.\\d{2})?)/);
-                                if (priceMatch && text.toLowerCase().includes('subscription') || 
-                                    text.toLowerCase().includes('purchase')) {
-                                    const price = '$' + priceMatch[1];
-                                    const name = text.replace(/\\$[\\d,]+(?:\\.\\d{2})?.*$/, '').trim();
-                                    if (name && name.length < 200) {
-                                        iapItems.push({ name: name, price: price });
-                                    }
-                                }
-                            }
-                        }
-                        
-                        // Remove duplicates
-                        const uniqueIaps = [];
-                        const seen = new Set();
-                        for (const iap of iapItems) {
-                            const key = iap.name + '|' + iap.price;
-                            if (!seen.has(key)) {
-                                seen.add(key);
-                                uniqueIaps.push(iap);
-                            }
-                        }
-                        
-                        return uniqueIaps.slice(0, 20); // Limit to 20 items
-                    }
-                """)
-                
-                if iap_section and len(iap_section) > 0:
-                    result['in_app_purchases'] = iap_section
-            except Exception as e:
-                pass
+            if page_data.get('inAppPurchases'):
+                result['in_app_purchases'] = page_data['inAppPurchases']
             
             # Extract description (first paragraph)
             try:
@@ -432,35 +924,18 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
                 desc_text = None
                 
                 # Strategy 1: Look for description in specific elements
-                desc_selectors = [
-                    'div[class*="description"]',
-                    'div[class*="product-review"]',
-                    'div[class*="app-description"]',
-                    'section[class*="description"]',
-                    'p[class*="description"]'
-                ]
-                
-                for selector in desc_selectors:
-                    try:
-                        desc_elem = soup.select_one(selector)
-                        if desc_elem:
-                            desc_text = desc_elem.get_text(strip=True)
-                            if desc_text and len(desc_text) > 50:
-                                break
-                    except:
-                        continue
+                # (text of the first match per selector, None if nothing matched)
+                for candidate in page_data.get('descriptionCandidates') or []:
+                    if candidate is not None:
+                        desc_text = candidate
+                        if desc_text and len(desc_text) > 50:
+                            break
                 
                 # Strategy 2: Look for text after app name/title
                 if not desc_text or len(desc_text) < 50:
-                    try:
-                        # Find h1 or title, then get next paragraph
-                        h1 = soup.find('h1')
-                        if h1:
-                            next_p = h1.find_next('p')
-                            if next_p:
-                                desc_text = next_p.get_text(strip=True)
-                    except:
-                        pass
+                    # First paragraph after the h1
+                    if page_data.get('headingParagraph') is not None:
+                        desc_text = page_data['headingParagraph']
                 
                 # Strategy 3: Extract from page text (look for longer paragraphs)
                 if not desc_text or len(desc_text) < 50:
@@ -481,71 +956,32 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
                 pass
             
             # Extract compatibility
-            compat_match = re.search(r'Requires\s+([^\n\r]+)', page_text, re.I)
+            compat_match = APPLE_TEXT_PATTERNS['compatibility'].search(page_text)
             if compat_match:
                 result['compatibility'] = compat_match.group(1).strip()
             
             # Extract copyright
-            copyright_match = re.search(r'©\s+([^\n\r]+)', page_text)
+            copyright_match = APPLE_TEXT_PATTERNS['copyright'].search(page_text)
             if copyright_match:
                 result['copyright'] = copyright_match.group(1).strip()
             
             # Extract release date / first launch date
             # Try multiple patterns for release date
             try:
-                # JavaScript extraction for release date (more reliable)
-                release_js = page.evaluate("""
-                    () => {
-                        const bodyText = document.body.innerText;
-                        // Look for "Released" followed by date in various formats
-                        const patterns = [
-                            /Released[\\s:]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})/i,
-                            /Release\\s+Date[\\s:]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})/i,
-                            /First\\s+Available[\\s:]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})/i,
-                            /Released[\\s:]+(\\d{1,2}[/-]\\d{1,2}[/-]\\d{4})/i,
-                        ];
-                        
-                        for (const pattern of patterns) {
-                            const match = bodyText.match(pattern);
-                            if (match && match[1]) {
-                                return match[1].trim();
-                            }
-                        }
-                        
-                        // Also check HTML for structured data
-                        const metaTags = document.querySelectorAll('meta');
-                        for (const tag of metaTags) {
-                            const property = tag.getAttribute('property') || tag.getAttribute('name') || '';
-                            const content = tag.getAttribute('content') || '';
-                            if ((property.includes('release') || property.includes('date')) && content) {
-                                const dateMatch = content.match(/(\\d{4}[\\/-]\\d{1,2}[\\/-]\\d{1,2}|[A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})/);
-                                if (dateMatch) {
-                                    return dateMatch[1].trim();
-                                }
-                            }
-                        }
-                        
-                        return null;
-                    }
-                """)
+                # Release date found by the page script (more reliable)
+                release_js = page_data.get('releaseDate')
                 if release_js:
                     result['release_date'] = release_js
                 else:
                     # Fallback: Pattern matching in page text
                     # Pattern 1: "Released: Dec 15, 2023" or "Released Dec 15, 2023"
-                    release_match = re.search(r'Released[:\s]+([A-Za-z]+\s+\d{1,2},?\s+\d{4})', page_text, re.I)
+                    release_match = APPLE_TEXT_PATTERNS['released'].search(page_text)
                     if release_match:
                         result['release_date'] = release_match.group(1).strip()
                     else:
                         # Pattern 2: Look for date patterns near "Release" or "First" keywords
-                        release_patterns = [
-                            r'(?:First\s+)?Released[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-                            r'(?:First\s+)?Released[:\s]+([A-Za-z]+\s+\d{1,2},?\s+\d{4})',
-                            r'Release\s+Date[:\s]+([A-Za-z]+\s+\d{1,2},?\s+\d{4})',
-                            r'First\s+Available[:\s]+([A-Za-z]+\s+\d{1,2},?\s+\d{4})',
-                        ]
-                        for pattern in release_patterns:
-                            match = re.search(pattern, page_text, re.I)
+                        for pattern in APPLE_RELEASE_PATTERNS:
+                            match = pattern.search(page_text)
                             if match:
                                 result['release_date'] = match.group(1).strip()
                                 break
@@ -553,47 +989,27 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
                 print(f"Warning: Error extracting release date: {str(e)}")
                 pass
             
-            # Extract version
-            try:
-                # Try JavaScript extraction first
-                version_js = page.evaluate("""
-                    () => {
-                        const bodyText = document.body.innerText;
-                        const match = bodyText.match(/Version[\\s:]+([\\d.]+)/i);
-                        return match ? match[1].trim() : null;
-                    }
-                """)
-                if version_js:
-                    result['version'] = version_js
-                else:
-                    # Fallback: Pattern matching
-                    version_match = re.search(r'Version[:\s]+([\d.]+)', page_text, re.I)
-                    if version_match:
-                        result['version'] = version_match.group(1).strip()
-            except Exception as e:
-                pass
+            # Extract version (JavaScript first, then pattern matching)
+            if page_data.get('version'):
+                result['version'] = page_data['version']
+            else:
+                version_match = APPLE_TEXT_PATTERNS['version'].search(page_text)
+                if version_match:
+                    result['version'] = version_match.group(1).strip()
             
             # Extract support URL
-            try:
-                support_links = soup.find_all('a', href=re.compile(r'support|help'))
-                if support_links:
-                    href = support_links[0].get('href', '')
-                    if href:
-                        result['support_url'] = href if href.startswith('http') else f"https://apps.apple.com{href}"
-            except:
-                pass
+            href = page_data.get('supportHref')
+            if href:
+                result['support_url'] = href if href.startswith('http') else f"https://apps.apple.com{href}"
             
             # Extract developer website
-            try:
-                dev_links = soup.find_all('a', href=re.compile(r'developer|publisher'))
-                if dev_links:
-                    href = dev_links[0].get('href', '')
-                    if href:
-                        result['developer_website'] = href if href.startswith('http') else f"https://apps.apple.com{href}"
-            except:
-                pass
+            href = page_data.get('developerHref')
+            if href:
+                result['developer_website'] = href if href.startswith('http') else f"https://apps.apple.com{href}"
             
-            browser.close()
+            _close_browser(browser, context, owns_browser)
+            if cache_key:
+                _cache_apple_result(cache_key, 'page', result)
             return result
             
     except Exception as e:
@@ -602,13 +1018,14 @@ def scrape_apple_app_store(url: str, headless: bool = True, timeout: int = 30000
         result['error'] = error_msg
         if browser:
             try:
-                browser.close()
+                _close_browser(browser, context, owns_browser)
             except:
                 pass
         return result
 
 
-def get_app_id_from_apple(search_term: str, headless: bool = True, timeout: int = 30000) -> Optional[str]:
+def get_app_id_from_apple(search_term: str, headless: bool = True, timeout: int = 30000,
+                          browser: Optional[Browser] = None) -> Optional[str]:
     """
     Search Apple App Store and extract the App ID from the first result.
     
@@ -616,31 +1033,31 @@ def get_app_id_from_apple(search_term: str, headless: bool = True, timeout: int
         search_term: App name to search for
         headless: Whether to run browser in headless mode
         timeout: Page load timeout in milliseconds
+        browser: Optional already-launched browser to reuse (see BrowserSession)
         
     Returns:
         App ID (numeric string) or None if not found
     """
-    browser = None
+    owns_browser = browser is None
+    context = None
     try:
-        with sync_playwright() as p:
-            # Configure browser launch args for better headless compatibility
-            launch_args = []
-            if headless:
-                # Add args to improve headless mode compatibility
-                launch_args.extend([
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-web-security',
-                    '--allow-running-insecure-content',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                ])
-            
-            browser = p.chromium.launch(
-                headless=headless,
-                args=launch_args if launch_args else None
-            )
+        with (sync_playwright() if owns_browser else contextlib.nullcontext()) as p:
+            if owns_browser:
+                # Configure browser launch args for better headless compatibility
+                launch_args = []
+                if headless:
+                    # Add args to improve headless mode compatibility
+                    launch_args.extend([
+                        '--disable-blink-features=AutomationControlled',
+                        '--disable-dev-shm-usage',
+                        '--no-sandbox',
+                        '--disable-setuid-sandbox',
+                        '--disable-web-security',
+                        '--allow-running-insecure-content',
+                        '--disable-features=IsolateOrigins,site-per-process',
+                    ])
+            
+                browser = _launch_browser(p, headless, launch_args)
             
             # Configure context with permissions and settings
             context = browser.new_context(
@@ -662,13 +1079,13 @@ def get_app_id_from_apple(search_term: str, headless: bool = True, timeout: int
                     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                 }
             )
+            _block_heavy_resources(context)
             page = context.new_page()
             page.set_default_timeout(timeout)
             
             # Navigate to Apple App Store search
             search_url = f"{APPLE_STORE_SEARCH_URL}?term={search_term.replace(' ', '+')}"
             page.goto(search_url, wait_until="domcontentloaded", timeout=timeout)
-            time.sleep(3)  # Wait for search results to load
             
             # Look for the first app result link
             # Apple Store search results have links like: /us/app/app-name/id123456789
@@ -702,7 +1119,7 @@ def get_app_id_from_apple(search_term: str, headless: bool = True, timeout: int
                 except Exception as e:
                     continue
             
-            browser.close()
+            _close_browser(browser, context, owns_browser)
             
             if app_url:
                 # Extract App ID from URL pattern: .../id123456789 or .../id/123456789
@@ -720,13 +1137,14 @@ def get_app_id_from_apple(search_term: str, headless: bool = True, timeout: int
         print(f"Error getting App ID from Apple Store: {e}")
         if browser:
             try:
-                browser.close()
+                _close_browser(browser, context, owns_browser)
             except:
                 pass
         return None
 
 
-def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 60000, direct_url: str = None, app_id: str = None) -> Dict:
+def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 60000, direct_url: str = None, app_id: str = None,
+                    browser: Optional[Browser] = None) -> Dict:
     """
     Scrape app data from SensorTower using the new workflow:
     1. Search Apple App Store to get App ID (if not provided)
@@ -739,6 +1157,7 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
         timeout: Page load timeout in milliseconds
         direct_url: Optional direct SensorTower URL to scrape (legacy support)
         app_id: Optional App ID to skip Apple Store search
+        browser: Optional already-launched browser to reuse (see BrowserSession)
         
     Returns:
         Dictionary containing extracted app data
@@ -764,27 +1183,26 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
         'rating_count': ''
     }
     
-    browser = None
+    owns_browser = browser is None
+    context = None
     try:
-        with sync_playwright() as p:
-            # Configure browser launch args for better headless compatibility
-            launch_args = []
-            if headless:
-                # Add args to improve headless mode compatibility and local network access
-                launch_args.extend([
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-web-security',
-                    '--allow-running-insecure-content',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                ])
-            
-            browser = p.chromium.launch(
-                headless=headless,
-                args=launch_args if launch_args else None
-            )
+        with (sync_playwright() if owns_browser else contextlib.nullcontext()) as p:
+            if owns_browser:
+                # Configure browser launch args for better headless compatibility
+                launch_args = []
+                if headless:
+                    # Add args to improve headless mode compatibility and local network access
+                    launch_args.extend([
+                        '--disable-blink-features=AutomationControlled',
+                        '--disable-dev-shm-usage',
+                        '--no-sandbox',
+                        '--disable-setuid-sandbox',
+                        '--disable-web-security',
+                        '--allow-running-insecure-content',
+                        '--disable-features=IsolateOrigins,site-per-process',
+                    ])
+            
+                browser = _launch_browser(p, headless, launch_args)
             
             # Configure context with permissions and settings for local network access
             context = browser.new_context(
@@ -816,10 +1234,10 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
                     app_id = search_term
                 else:
                     # Search Apple App Store to get App ID
-                    app_id = get_app_id_from_apple(search_term, headless=headless, timeout=30000)
+                    app_id = get_app_id_from_apple(search_term, headless=headless, timeout=30000, browser=browser)
                     if not app_id:
                         result['error'] = f"Could not find App ID for '{search_term}' on Apple App Store. Please check the app name."
-                        browser.close()
+                        _close_browser(browser, context, owns_browser)
                         return result
             
             # Step 2: Construct SensorTower URL
@@ -829,7 +1247,7 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
                 sensortower_url = f"{SENSORTOWER_APP_BASE_URL}/overview/{app_id}?country=US"
             else:
                 result['error'] = "No App ID or direct URL provided"
-                browser.close()
+                _close_browser(browser, context, owns_browser)
                 return result
             
             # Step 3: Navigate to SensorTower overview page
@@ -842,12 +1260,12 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
                 
                 if 'login' in current_url.lower() or 'sign-in' in current_url.lower() or 'login' in page_content[:5000]:
                     result['error'] = f"Login required to access SensorTower. The URL {sensortower_url} requires authentication."
-                    browser.close()
+                    _close_browser(browser, context, owns_browser)
                     return result
                 
                 if response and response.status >= 400:
                     result['error'] = f"Failed to load SensorTower page: {sensortower_url} (Status: {response.status})"
-                    browser.close()
+                    _close_browser(browser, context, owns_browser)
                     return result
                 
                 # Try to fetch API data directly (more reliable than scraping rendered page)
@@ -884,7 +1302,7 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
                 
             except Exception as e:
                 result['error'] = f"Error loading SensorTower URL {sensortower_url}: {str(e)}"
-                browser.close()
+                _close_browser(browser, context, owns_browser)
                 return result
             
             # Store the app_id in result
@@ -922,13 +1340,13 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
             
             # Extract from HTML meta tags and JSON-LD (reliable, available immediately)
             html_content = page.content()
-            soup = BeautifulSoup(html_content, 'html.parser')
+            tree = LexborHTMLParser(html_content)
             
             # Extract from JSON-LD schema (most reliable)
-            json_ld_script = soup.find('script', type='application/ld+json')
-            if json_ld_script:
+            json_ld_script = tree.css_first('script[type="application/ld+json"]')
+            if json_ld_script is not None:
                 try:
-                    json_ld_data = json.loads(json_ld_script.string)
+                    json_ld_data = json.loads(json_ld_script.text())
                     if not result['app_name'] and 'name' in json_ld_data:
                         result['app_name'] = json_ld_data['name']
                     if not result['categories'] and 'applicationCategory' in json_ld_data:
@@ -947,18 +1365,18 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
                     pass
             
             # Extract from meta tags
-            og_title = soup.find('meta', property='og:title')
-            if og_title and og_title.get('content') and not result['app_name']:
-                title = og_title['content']
+            og_title = tree.css_first('meta[property="og:title"]')
+            if og_title is not None and og_title.attributes.get('content') and not result['app_name']:
+                title = og_title.attributes['content']
                 # Extract app name from title (format: "App Name - Apple App Store - US - ...")
                 title_parts = title.split(' - ')
                 if title_parts:
                     result['app_name'] = title_parts[0].strip()
             
             # Extract from meta description
-            meta_desc = soup.find('meta', property='og:description') or soup.find('meta', name='description')
-            if meta_desc and meta_desc.get('content'):
-                desc = meta_desc['content']
+            meta_desc = tree.css_first('meta[property="og:description"]') or tree.css_first('meta[name="description"]')
+            if meta_desc is not None and meta_desc.attributes.get('content'):
+                desc = meta_desc.attributes['content']
                 # Extract downloads from description if available
                 if not result['downloads_worldwide']:
                     download_match = re.search(r'(\d+[KMB]?)\s*downloads?', desc, re.I)
@@ -1019,7 +1437,7 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
             
             # Also get HTML for fallback parsing
             html_content = page.content()
-            soup = BeautifulSoup(html_content, 'html.parser')
+            tree = LexborHTMLParser(html_content)
             
             # Debug: Check if we have meaningful content
             if len(page_text) < 100:
@@ -1047,7 +1465,7 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
                 except:
                     page_text = page.inner_text('body')
                 html_content = page.content()
-                soup = BeautifulSoup(html_content, 'html.parser')
+                tree = LexborHTMLParser(html_content)
             
             # Store page text length for debugging (if needed)
             if len(page_text) < 50:
@@ -1162,9 +1580,9 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
             
             # Strategy 5: Look for meta tags
             if not name_found:
-                og_title = soup.find('meta', property='og:title')
-                if og_title and og_title.get('content'):
-                    result['app_name'] = og_title['content'].strip()
+                og_title = tree.css_first('meta[property="og:title"]')
+                if og_title is not None and og_title.attributes.get('content'):
+                    result['app_name'] = og_title.attributes['content'].strip()
                     name_found = True
             
             # Extract app ID from URL (should already be set, but verify)
@@ -1772,15 +2190,20 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
                 except:
                     pass
             
-            browser.close()
+            context.close()  # Keep the browser for the Apple Store scrape below
             
             # Automatically fetch Apple App Store ratings if we have an app_id
             # Fetch ratings even if SensorTower scraping had errors (ratings are independent)
             if result.get('app_id'):
                 try:
-                    apple_url = f"{APPLE_STORE_BASE_URL}/us/app/id{result['app_id']}"
-                    print(f"Fetching Apple App Store ratings from: {apple_url}")
-                    apple_data = scrape_apple_app_store(apple_url, headless=headless, timeout=30000)
+                    # The iTunes Lookup API returns the same fields as one small JSON
+                    # response; only render the store page when it has no ratings
+                    print(f"Fetching Apple App Store ratings for app ID {result['app_id']}")
+                    apple_data = lookup_apple_metadata(result['app_id'])
+                    if not (apple_data.get('average_rating') or apple_data.get('rating_count')):
+                        apple_url = f"{APPLE_STORE_BASE_URL}/us/app/id{result['app_id']}"
+                        print(f"Lookup API had no ratings, falling back to: {apple_url}")
+                        apple_data = scrape_apple_app_store(apple_url, headless=headless, timeout=30000, browser=browser)
                     
                     # Always try to add rating data if it exists, regardless of error status
                     # (Some apps might have ratings even if other data extraction failed)
@@ -1809,6 +2232,9 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
                     traceback.print_exc()
                     # Don't fail the whole scrape if rating fetch fails
             
+            if owns_browser:
+                browser.close()
+            
             return result
             
     except Exception as e:
@@ -1817,7 +2243,7 @@ def scrape_app_data(search_term: str, headless: bool = True, timeout: int = 6000
         result['error'] = error_msg
         if browser:
             try:
-                browser.close()
+                _close_browser(browser, context, owns_browser)
             except:
                 pass
         return result
@@ -1846,10 +2272,7 @@ def search_apps_by_category(category: str, headless: bool = True) -> List[Dict]:
                     '--no-sandbox',
                 ])
             
-            browser = p.chromium.launch(
-                headless=headless,
-                args=launch_args if launch_args else None
-            )
+            browser = _launch_browser(p, headless, launch_args)
             context = browser.new_context(
                 user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
                 viewport={'width': 1920, 'height': 1080},
@@ -1865,17 +2288,18 @@ def search_apps_by_category(category: str, headless: bool = True) -> List[Dict]:
             
             # Extract app links from the category page
             html_content = page.content()
-            soup = BeautifulSoup(html_content, 'html.parser')
+            tree = LexborHTMLParser(html_content)
             
-            app_links = soup.find_all('a', href=re.compile(r'/apps/ios/app/'))
+            app_links = [link for link in tree.css('a[href]')
+                         if re.search(r'/apps/ios/app/', link.attributes.get('href') or '')]
             
             # Limit to first 10 results to avoid overwhelming
             for link in app_links[:10]:
-                app_path = link.get('href', '')
+                app_path = link.attributes.get('href') or ''
                 if app_path:
                     app_url = f"{SENSORTOWER_BASE_URL}{app_path}" if not app_path.startswith('http') else app_path
                     # Extract app name from link text or URL
-                    app_name = link.get_text(strip=True) or app_path.split('/')[-1]
+                    app_name = link.text(strip=True) or app_path.split('/')[-1]
                     # Scrape individual app data
                     app_data = scrape_app_data(app_name, headless=headless)
                     if app_data.get('app_name'):